@@ -0,0 +1,108 @@
+"""
+Benchmark do classificador de mensagens de commit.
+
+Gera mensagens sintéticas (no padrão, fora do padrão, com escopo e com corpos longos de várias linhas)
+e mede quantas mensagens por segundo são classificadas pelo CommitClassifier, comparando com a
+classificação anterior, que compilava as expressões regulares a cada mensagem.
+
+Uso, a partir da raiz do projeto:
+
+    python -m benchmarks.commit_classifier_benchmark --messages 2000000
+"""
+import argparse
+import random
+import re
+import time
+
+from commit_classifier import RULE_SETS, CommitClassifier
+
+SUBJECTS = ["add login", "fix typo", "update deps", "wip", "Merge branch 'develop'", "x"]
+
+
+def create_messages(quantity, seed, body_lines):
+    """
+    Gera mensagens de commit sintéticas.
+
+    Args:
+        quantity (int): Quantidade de mensagens.
+        seed (int): Semente do gerador de números aleatórios.
+        body_lines (int): Quantidade máxima de linhas do corpo das mensagens.
+
+    Returns:
+        list: Lista com as mensagens geradas.
+    """
+    randomizer = random.Random(seed)
+    types = list(RULE_SETS["conventional"]) + ["feature", "update", "Fix"]
+    body = "\n".join(f"- detail line {line}" for line in range(body_lines))
+    messages = []
+    for _ in range(quantity):
+        commit_type = randomizer.choice(types)
+        scope = randomizer.choice(["", "(api)", "(ui): (core)"])
+        message = f"{commit_type}{scope}: {randomizer.choice(SUBJECTS)}"
+        if randomizer.random() < 0.2:
+            message = randomizer.choice(SUBJECTS)
+        if randomizer.random() < 0.3:
+            message += "\n\n" + body[: randomizer.randint(0, len(body))]
+        messages.append(message)
+    return messages
+
+
+def legacy_count(messages):
+    commits_per_type = {}
+    with_pattern = 0
+    for message in messages:
+        commit_pattern = re.compile(
+            r"^(docs|doc|fix|style|feat|refactor|perf|test|build|ci|chore|revert)(\(.*\))?:(\s){0,4}(\S){1}(.|\n)*$"
+        )
+        if commit_pattern.match(message):
+            commit_type = re.compile("^[a-zA-Z]+").search(message)[0]
+            commits_per_type[commit_type] = commits_per_type.get(commit_type, 0) + 1
+            with_pattern += 1
+    return with_pattern, commits_per_type
+
+
+def measure(function, messages):
+    start = time.perf_counter()
+    result = function(messages)
+    elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2_000_000)
+    parser.add_argument("--legacy-messages", type=int, default=200_000)
+    parser.add_argument("--body-lines", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    messages = create_messages(args.messages, args.seed, args.body_lines)
+    classifier = CommitClassifier()
+
+    def count(messages):
+        counters = {"commits_with_pattern": 0, "commits_without_pattern": 0, "commits_per_type": {}}
+        return classifier.count(iter(messages), counters)
+
+    counters, elapsed = measure(count, messages)
+    print(
+        f"CommitClassifier: {len(messages)} mensagens em {elapsed:.2f}s "
+        f"({len(messages) / elapsed:,.0f} mensagens/s)"
+    )
+
+    legacy_messages = messages[: args.legacy_messages]
+    (legacy_with_pattern, legacy_per_type), legacy_elapsed = measure(legacy_count, legacy_messages)
+    print(
+        f"Classificação anterior: {len(legacy_messages)} mensagens em {legacy_elapsed:.2f}s "
+        f"({len(legacy_messages) / legacy_elapsed:,.0f} mensagens/s)"
+    )
+
+    check = count(legacy_messages)
+    if (check["commits_with_pattern"], check["commits_per_type"]) != (
+        legacy_with_pattern,
+        legacy_per_type,
+    ):
+        raise SystemExit("Resultado do CommitClassifier diverge da classificação anterior")
+
+
+if __name__ == "__main__":
+    main()
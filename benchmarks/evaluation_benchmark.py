@@ -0,0 +1,437 @@
+"""
+Benchmark da avaliação de repositórios, sem acesso ao GitHub ou a um SonarQube real.
+
+Sobe um servidor HTTP local que imita os endpoints do GitHub usados pelo bot (repositórios, commits,
+branches, pull requests e linguagens com paginação pelo cabeçalho Link, limite de requisições com os
+cabeçalhos X-RateLimit-*, e projectsV2 no /graphql) e os endpoints do SonarQube (projects/create,
+projects/search, project_analyses/search, measures/component, measures/search e ce/task), para uma
+organização sintética com N repositórios de M commits. As análises são feitas por um scanner falso que só registra a tarefa do
+Compute Engine, e os checkouts são pastas vazias.
+
+Mede repositórios por minuto, requisições por repositório e pico de memória (tracemalloc) de
+make_evaluation (um repositório por vez) e de make_many_evaluations.
+
+Uso, a partir da raiz do projeto:
+
+    python -m benchmarks.evaluation_benchmark --repositories 50 --commits 2000 --latency 0.02
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from main import SonarAndGitEvaluation
+from sonar_scanner import ScannerPool, ScannerRunner
+from sonar_task_tracker import CeTaskTracker
+
+COMMIT_TYPES = ["feat", "fix", "docs", "chore", "refactor", "test"]
+BRANCHES = ["main", "develop", "feature/login", "feature/cards", "hotfix/typo"]
+COLUMNS = ["🆕 New", "📋 Backlog", "🏗 In progress", "👀 In review", "✅ Done"]
+MEASURES = {
+    "duplicated_lines_density": "3.5",
+    "maintainability_issues": json.dumps({"LOW": 4, "MEDIUM": 2, "HIGH": 1, "total": 7}),
+    "reliability_issues": json.dumps({"LOW": 1, "MEDIUM": 0, "HIGH": 0, "total": 1}),
+    "security_issues": json.dumps({"LOW": 0, "MEDIUM": 1, "HIGH": 0, "total": 1}),
+    "security_hotspots": "2",
+    "bugs": "1",
+    "code_smells": "7",
+    "vulnerabilities": "1",
+}
+
+
+class SyntheticOrganization:
+    def __init__(self, name, repositories, commits, pulls=3, cards=20) -> None:
+        """
+        Organização sintética, com os mesmos dados gerados a cada execução.
+
+        Args:
+            name (str): Nome da organização.
+            repositories (int): Quantidade de repositórios.
+            commits (int): Quantidade de commits de cada repositório.
+            pulls (int): Quantidade de pull requests abertos de cada repositório.
+            cards (int): Quantidade de cards do projeto de cada repositório.
+        """
+        self.name = name
+        self.repositories = [f"Repository{index}" for index in range(repositories)]
+        self.commits = commits
+        self.pulls = pulls
+        self.cards = cards
+
+    def get_commits(self, repository_name):
+        return [
+            {
+                "sha": f"{repository_name}-{index}",
+                "commit": {
+                    "message": (
+                        f"{COMMIT_TYPES[index % len(COMMIT_TYPES)]}: change {index}"
+                        if index % 4
+                        else f"change {index}"
+                    ),
+                    "committer": {"date": f"2024-01-01T00:00:{index % 60:02d}Z"},
+                },
+            }
+            for index in range(self.commits)
+        ]
+
+    def get_repositories(self):
+        return [
+            {
+                "name": repository_name,
+                "size": (index % 7 + 1) * 1000,
+                "fork": False,
+                "archived": False,
+                "pushed_at": f"2024-01-{index % 28 + 1:02d}T00:00:00Z",
+                "language": "Python",
+            }
+            for index, repository_name in enumerate(self.repositories)
+        ]
+
+    def get_projects(self):
+        return [
+            {
+                "id": f"P{index}",
+                "title": "Backlog -" + re.sub(r"([A-Z])", r" \1", repository_name),
+                "items": {
+                    "nodes": [
+                        {"status": {"column": COLUMNS[card % len(COLUMNS)]}}
+                        for card in range(self.cards)
+                    ],
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                },
+            }
+            for index, repository_name in enumerate(self.repositories)
+        ]
+
+
+class FakeServer:
+    def __init__(self, latency=0.0) -> None:
+        """
+        Servidor HTTP local, em uma thread separada, que conta as requisições recebidas e espera latency
+        segundos antes de cada resposta.
+
+        Args:
+            latency (float): Latência, em segundos, de cada resposta.
+        """
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.handle(self, "GET")
+
+            def do_POST(self):
+                server.handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, handler, method):
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        url = urlparse(handler.path)
+        length = int(handler.headers.get("Content-Length", 0))
+        body = handler.rfile.read(length) if length else b""
+        if handler.headers.get("Content-Type") == "application/json":
+            body = json.loads(body)
+        else:
+            body = parse_qs(body.decode("utf-8"))
+        status, content, headers = self.route(method, url.path, parse_qs(url.query), body)
+        data = json.dumps(content).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def route(self, method, path, query, body):
+        raise NotImplementedError
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeGitHub(FakeServer):
+    def __init__(self, organization, latency=0.0, max_per_page=100, rate_limit=5000, rate_window=3600) -> None:
+        """
+        Imita a API REST e GraphQL do GitHub para uma organização sintética.
+
+        Args:
+            organization (SyntheticOrganization): Organização servida.
+            latency (float): Latência, em segundos, de cada resposta.
+            max_per_page (int): Tamanho máximo das páginas, mesmo que per_page seja maior.
+            rate_limit (int): Quantidade de requisições permitidas em cada janela.
+            rate_window (float): Duração, em segundos, da janela do limite de requisições.
+        """
+        self.organization = organization
+        self.max_per_page = max_per_page
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.window_start = time.time()
+        self.used = 0
+        self.commits = {}
+        super().__init__(latency)
+
+    def get_rate_limit_headers(self, resource):
+        with self.lock:
+            now = time.time()
+            if now >= self.window_start + self.rate_window:
+                self.window_start = now
+                self.used = 0
+            self.used += 1
+            remaining = max(self.rate_limit - self.used, 0)
+            exceeded = self.used > self.rate_limit
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(self.window_start + self.rate_window)),
+            "X-RateLimit-Resource": resource,
+        }
+        return exceeded, headers
+
+    def route(self, method, path, query, body):
+        exceeded, headers = self.get_rate_limit_headers("graphql" if path == "/graphql" else "core")
+        if exceeded:
+            return 403, {"message": "API rate limit exceeded"}, headers
+        if path == "/graphql":
+            return 200, self.get_graphql(body["query"]), headers
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "orgs":
+            items = self.organization.get_repositories()
+        elif parts[-1] == "languages":
+            return 200, {"Python": 1000, "HTML": 200, "JavaScript": 500}, headers
+        elif parts[-1] == "commits":
+            items = self.get_commits(parts[2])
+            if "since" in query:
+                items = [item for item in items if item["commit"]["committer"]["date"] >= query["since"][0]]
+        elif parts[-1] == "branches":
+            items = [{"name": name} for name in BRANCHES]
+        elif parts[-1] == "pulls":
+            items = [{"number": number} for number in range(self.organization.pulls)]
+        else:
+            return 404, {"message": "Not Found"}, headers
+        return self.get_page(path, query, items, headers)
+
+    def get_commits(self, repository_name):
+        with self.lock:
+            if repository_name not in self.commits:
+                self.commits[repository_name] = self.organization.get_commits(repository_name)
+            return self.commits[repository_name]
+
+    def get_page(self, path, query, items, headers):
+        per_page = min(int(query.get("per_page", ["30"])[0]), self.max_per_page)
+        page = int(query.get("page", ["1"])[0])
+        last_page = max(1, -(-len(items) // per_page))
+        extra = "".join(
+            f"&{key}={values[0]}" for key, values in query.items() if key not in ("page", "per_page")
+        )
+        if page < last_page:
+            url = f"{self.url}{path}?per_page={per_page}{extra}"
+            headers["Link"] = f'<{url}&page={page + 1}>; rel="next", <{url}&page={last_page}>; rel="last"'
+        return 200, items[(page - 1) * per_page : page * per_page], headers
+
+    def get_graphql(self, query):
+        if "projectsV2" not in query:
+            return {"errors": [{"message": "Consulta não suportada pelo benchmark"}]}
+        return {
+            "data": {
+                "organization": {
+                    "projectsV2": {
+                        "nodes": self.organization.get_projects(),
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    }
+                }
+            }
+        }
+
+
+class FakeSonarQube(FakeServer):
+    def __init__(self, latency=0.0) -> None:
+        """
+        Imita os endpoints do SonarQube usados pelo bot. Toda tarefa do Compute Engine registrada por
+        create_task já é retornada como concluída.
+
+        Args:
+            latency (float): Latência, em segundos, de cada resposta.
+        """
+        self.projects = set()
+        self.tasks = {}
+        super().__init__(latency)
+
+    def create_task(self, project_key):
+        task_id = uuid.uuid4().hex
+        with self.lock:
+            self.tasks[task_id] = project_key
+        return task_id
+
+    def route(self, method, path, query, body):
+        if path == "/api/projects/create":
+            with self.lock:
+                self.projects.add(query["project"][0])
+            return 200, {"project": {"key": query["project"][0]}}, {}
+        if path == "/api/projects/search":
+            with self.lock:
+                components = [{"key": key} for key in sorted(self.projects)]
+            return 200, {"components": components, "paging": {"total": len(components)}}, {}
+        if path == "/api/project_analyses/search":
+            return 200, {"analyses": [{"key": uuid.uuid4().hex}], "paging": {"total": 1}}, {}
+        if path == "/api/ce/task":
+            task_id = query["id"][0]
+            return 200, {"task": {"id": task_id, "status": "SUCCESS"}}, {}
+        if path == "/api/measures/component":
+            measures = [{"metric": key, "value": value} for key, value in MEASURES.items()]
+            return 200, {"component": {"key": query["component"][0], "measures": measures}}, {}
+        if path == "/api/measures/search":
+            measures = [
+                {"component": project_key, "metric": key, "value": value}
+                for project_key in query["projectKeys"][0].split(",")
+                for key, value in MEASURES.items()
+            ]
+            return 200, {"measures": measures}, {}
+        return 404, {"errors": [{"msg": "Not Found"}]}, {}
+
+
+class FakeScannerRunner(ScannerRunner):
+    def __init__(self, sonarqube) -> None:
+        """
+        Scanner que não analisa os arquivos: só registra uma tarefa concluída no FakeSonarQube e escreve o
+        report-task.txt com o ceTaskId, como o sonar-scanner faria.
+
+        Args:
+            sonarqube (FakeSonarQube): SonarQube falso.
+        """
+        self.sonarqube = sonarqube
+        self.host_url = sonarqube.url
+
+    def run(self, workspace, properties, sonar_token):
+        task_id = self.sonarqube.create_task(properties["sonar.projectKey"])
+        os.makedirs(os.path.join(workspace, ".scannerwork"), exist_ok=True)
+        with open(os.path.join(workspace, ".scannerwork", "report-task.txt"), "w", encoding="utf-8") as file:
+            file.write(f"projectKey={properties['sonar.projectKey']}\nceTaskId={task_id}\n")
+
+
+class EmptyCheckoutCache:
+    def add_worktree(self, github_url, path):
+        """
+        Cria uma pasta vazia no lugar do checkout do repositório.
+        """
+        os.makedirs(path, exist_ok=True)
+
+
+def run_benchmark(mode, args, organization):
+    """
+    Executa a avaliação de todos os repositórios da organização com servidores falsos novos.
+
+    Args:
+        mode (str): "evaluation" para make_evaluation em cada repositório, ou "many" para make_many_evaluations.
+        args (argparse.Namespace): Parâmetros do benchmark.
+        organization (SyntheticOrganization): Organização avaliada.
+
+    Returns:
+        dict: Resultado com repositórios por minuto, requisições por repositório e pico de memória.
+    """
+    github = FakeGitHub(
+        organization, args.latency, args.max_per_page, args.rate_limit, args.rate_window
+    )
+    sonarqube = FakeSonarQube(args.latency)
+    directory = tempfile.mkdtemp(prefix="sonar_and_github_benchmark_")
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        analyzer = SonarAndGitEvaluation(
+            organization.name,
+            os.path.join(directory, "benchmark"),
+            "benchmark-token",
+            "benchmark-token",
+            has_project=True,
+            clone_cache=EmptyCheckoutCache(),
+            scanner=ScannerPool(FakeScannerRunner(sonarqube), args.sonar_workers, directory),
+            tracker=CeTaskTracker("benchmark-token", sonarqube.url, initial_delay=0.01),
+            base_url=github.url,
+            sonar_url=sonarqube.url,
+            branch_source="api",
+        )
+        if mode == "evaluation":
+            analyzer.projects = analyzer.get_cards_of_projects()
+            for repository_name in organization.repositories:
+                analyzer.make_evaluation(repository_name)
+            analyzer.close_outputs()
+        else:
+            analyzer.make_many_evaluations(
+                args.github_workers, args.sonar_workers, args.measure_batch_size
+            )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        github.stop()
+        sonarqube.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    quantity = len(organization.repositories)
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "repositories_per_minute": quantity / elapsed * 60,
+        "github_requests_per_repository": github.requests / quantity,
+        "sonar_requests_per_repository": sonarqube.requests / quantity,
+        "peak_memory_mb": peak / 1024 / 1024,
+        "failures": len(analyzer.failures),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repositories", type=int, default=20)
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--max-per-page", type=int, default=100)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--rate-window", type=float, default=3600)
+    parser.add_argument("--github-workers", type=int, default=8)
+    parser.add_argument("--sonar-workers", type=int, default=4)
+    parser.add_argument("--measure-batch-size", type=int, default=1)
+    parser.add_argument("--mode", choices=["evaluation", "many", "both"], default="both")
+    args = parser.parse_args()
+
+    organization = SyntheticOrganization("benchmark-org", args.repositories, args.commits)
+    modes = ["evaluation", "many"] if args.mode == "both" else [args.mode]
+    print(
+        f"{args.repositories} repositórios x {args.commits} commits, latência de {args.latency}s, "
+        f"páginas de até {args.max_per_page} registros"
+    )
+    for mode in modes:
+        result = run_benchmark(mode, args, organization)
+        print(
+            f"{result['mode']:>10}: {result['seconds']:.2f}s, "
+            f"{result['repositories_per_minute']:.1f} repositórios/min, "
+            f"{result['github_requests_per_repository']:.1f} requisições ao GitHub/repositório, "
+            f"{result['sonar_requests_per_repository']:.1f} requisições ao SonarQube/repositório, "
+            f"pico de memória de {result['peak_memory_mb']:.1f} MB, "
+            f"{result['failures']} falhas"
+        )
+
+
+if __name__ == "__main__":
+    main()
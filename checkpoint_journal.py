@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+
+
+class CheckpointJournal:
+    def __init__(self, file_name=".checkpoint_journal.jsonl") -> None:
+        """
+        Registra, em um arquivo JSON Lines, cada repositório avaliado assim que termina, com a avaliação
+        completa ou o erro que interrompeu a avaliação, para que uma execução interrompida possa ser retomada
+        sem avaliar novamente os repositórios já concluídos.
+
+        Args:
+            file_name (str): Nome do arquivo do diário.
+        """
+        self.file_name = file_name
+        self.lock = threading.Lock()
+
+    def load(self):
+        """
+        Lê o diário, mantendo somente o último registro de cada repositório. Uma linha incompleta no fim do
+        arquivo, escrita durante uma interrupção, é ignorada.
+
+        Returns:
+            dict: Dicionário com o nome do repositório como chave e o registro como valor, com as chaves
+            "name", "status" ("done" ou "failed") e "evaluation" ou "error".
+        """
+        entries = {}
+        if not os.path.exists(self.file_name):
+            return entries
+        with open(self.file_name, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[entry["name"]] = entry
+        return entries
+
+    def reset(self):
+        """
+        Apaga os registros do diário, para uma nova execução completa.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            open(self.file_name, "w", encoding="utf-8").close()
+
+    def record_success(self, evaluation):
+        """
+        Registra a avaliação completa de um repositório.
+
+        Args:
+            evaluation (dict): Avaliação do repositório.
+
+        Returns:
+            None
+        """
+        self.append({"name": evaluation["name"], "status": "done", "evaluation": evaluation})
+
+    def record_failure(self, repository_name, error):
+        """
+        Registra o erro que interrompeu a avaliação de um repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            error (str): Descrição do erro.
+
+        Returns:
+            None
+        """
+        self.append({"name": repository_name, "status": "failed", "error": error})
+
+    def append(self, entry):
+        with self.lock:
+            with open(self.file_name, "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+
+from local_git_repository import LocalGitRepository
+
+LAST_USED_FILE = "last_used"
+
+
+class CloneCache:
+    def __init__(
+        self,
+        directory=".local_clones",
+        max_bytes=20 * 1024**3,
+        clone_filter="blob:none",
+        depth=None,
+        git_token=None,
+    ) -> None:
+        """
+        Cache de clones bare dos repositórios, indexados pela URL. Cada repositório é clonado uma única vez,
+        e nas execuções seguintes somente as alterações são buscadas com git fetch. Quando o tamanho total
+        passa de max_bytes, os clones usados há mais tempo são apagados.
+
+        Args:
+            directory (str): Pasta onde os clones são salvos.
+            max_bytes (int): Tamanho máximo, em bytes, ocupado pelos clones.
+            clone_filter (str): Filtro de clone parcial, por exemplo "blob:none", ou None para clones completos.
+            depth (int): Profundidade para clones rasos, ou None para o histórico completo. Com clones rasos,
+            a quantidade de commits lida do clone fica limitada a essa profundidade.
+            git_token (str): Token do GitHub usado no clone e no fetch, necessário para repositórios privados.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.clone_filter = clone_filter
+        self.depth = depth
+        self.git_token = git_token
+        self.lock = threading.Lock()
+        self.repository_locks = {}
+        self.sizes = {}
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                self.sizes[path] = self.get_directory_size(path)
+
+    def get_repository(self, github_url):
+        """
+        Busca o clone do repositório no cache, criando ou atualizando quando necessário.
+
+        Args:
+            github_url (str): URL do repositório GitHub.
+
+        Returns:
+            LocalGitRepository: Clone bare do repositório.
+        """
+        path = self.get_path(github_url)
+        with self.lock:
+            repository_lock = self.repository_locks.setdefault(path, threading.Lock())
+
+        with repository_lock:
+            repository = LocalGitRepository(path, self.git_token)
+            repository.update(github_url, self.clone_filter, self.depth)
+            self.touch(path)
+            size = self.get_directory_size(path)
+
+        with self.lock:
+            self.sizes[path] = size
+        self.evict(keep=path)
+        return repository
+
+    def add_worktree(self, github_url, path):
+        """
+        Coloca os arquivos da branch padrão do repositório em uma pasta de trabalho, a partir do clone do cache.
+
+        Args:
+            github_url (str): URL do repositório GitHub.
+            path (str): Pasta onde os arquivos serão colocados, que não deve existir.
+
+        Returns:
+            None
+        """
+        repository = self.get_repository(github_url)
+        with self.repository_locks[repository.path]:
+            repository.add_worktree(path)
+
+    def evict(self, keep=None):
+        """
+        Apaga os clones usados há mais tempo até que o tamanho total fique dentro do limite. Clones
+        que estão sendo atualizados no momento não são apagados.
+
+        Args:
+            keep (str): Caminho de um clone que não deve ser apagado.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            candidates = sorted(
+                (path for path in self.sizes if path != keep),
+                key=self.get_last_used,
+            )
+            while sum(self.sizes.values()) > self.max_bytes and candidates:
+                path = candidates.pop(0)
+                repository_lock = self.repository_locks.setdefault(path, threading.Lock())
+                if not repository_lock.acquire(blocking=False):
+                    continue
+                try:
+                    shutil.rmtree(path, ignore_errors=True)
+                    del self.sizes[path]
+                finally:
+                    repository_lock.release()
+
+    def get_path(self, github_url):
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", github_url.rstrip("/").split("/")[-1])
+        digest = hashlib.sha1(github_url.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, f"{name}-{digest}.git")
+
+    def touch(self, path):
+        with open(os.path.join(path, LAST_USED_FILE), "w") as file:
+            file.write(str(time.time()))
+
+    def get_last_used(self, path):
+        try:
+            return os.path.getmtime(os.path.join(path, LAST_USED_FILE))
+        except OSError:
+            return 0
+
+    def get_directory_size(self, path):
+        size = 0
+        for root, _, files in os.walk(path):
+            for file_name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, file_name))
+                except OSError:
+                    pass
+        return size
+
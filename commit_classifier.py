@@ -0,0 +1,106 @@
+import re
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+RULE_SETS = {
+    "conventional": (
+        "docs",
+        "doc",
+        "fix",
+        "style",
+        "feat",
+        "refactor",
+        "perf",
+        "test",
+        "build",
+        "ci",
+        "chore",
+        "revert",
+    ),
+    "angular": ("build", "ci", "docs", "feat", "fix", "perf", "refactor", "style", "test"),
+}
+
+
+class CommitClassification(NamedTuple):
+    compliant: bool
+    type: Optional[str]
+    scope: Optional[str]
+
+
+class CommitClassifier:
+    def __init__(self, rule_set="conventional", types=None) -> None:
+        """
+        Classifica mensagens de commit de acordo com o padrão de commits, extraindo tipo e escopo
+        com uma única expressão regular compilada uma vez. Somente o início da mensagem é avaliado,
+        por isso o tempo de cada classificação não depende do tamanho do corpo da mensagem.
+
+        Args:
+            rule_set (str): Nome do conjunto de tipos pré-configurado em RULE_SETS.
+            types (list): Lista de tipos aceitos, que substitui o rule_set quando informada.
+        """
+        types = types or RULE_SETS[rule_set]
+        alternatives = "|".join(
+            re.escape(commit_type) for commit_type in sorted(types, key=len, reverse=True)
+        )
+        # O escopo só é capturado até o primeiro ")"; a segunda alternativa mantém aceitas as mensagens
+        # com ")" dentro do escopo, que já eram consideradas no padrão.
+        self.pattern = re.compile(
+            rf"({alternatives})(?:\(([^)\n]*)\)|\(.*\))?:\s{{0,4}}\S"
+        )
+
+    def classify(self, commit_message) -> CommitClassification:
+        """
+        Classifica uma mensagem de commit.
+
+        Args:
+            commit_message (str): texto com a mensagem de commit
+
+        Returns:
+            CommitClassification: se a mensagem está no padrão, e o tipo e o escopo do commit.
+        """
+        match = self.pattern.match(commit_message)
+        if match is None:
+            return CommitClassification(False, None, None)
+        return CommitClassification(True, match[1], match[2])
+
+    def classify_many(self, commit_messages: Iterable[str]) -> Iterator[CommitClassification]:
+        """
+        Classifica as mensagens de commit à medida que são recebidas.
+
+        Args:
+            commit_messages (Iterable[str]): mensagens de commit.
+
+        Returns:
+            Iterator[CommitClassification]: classificação de cada mensagem, na mesma ordem.
+        """
+        classify = self.classify
+        for commit_message in commit_messages:
+            yield classify(commit_message)
+
+    def count(self, commit_messages: Iterable[str], counters):
+        """
+        Classifica as mensagens de commit à medida que são recebidas e soma o resultado aos contadores,
+        sem guardar as mensagens.
+
+        Args:
+            commit_messages (Iterable[str]): mensagens de commit.
+            counters (dict): dicionário com as chaves "commits_with_pattern", "commits_without_pattern"
+            e "commits_per_type", que é atualizado.
+
+        Returns:
+            dict: os mesmos contadores recebidos, atualizados.
+        """
+        match = self.pattern.match
+        commits_per_type = counters["commits_per_type"]
+        with_pattern = 0
+        without_pattern = 0
+        for commit_message in commit_messages:
+            result = match(commit_message)
+            if result is None:
+                without_pattern += 1
+            else:
+                commit_type = result[1]
+                commits_per_type[commit_type] = commits_per_type.get(commit_type, 0) + 1
+                with_pattern += 1
+        counters["commits_with_pattern"] += with_pattern
+        counters["commits_without_pattern"] += without_pattern
+        return counters
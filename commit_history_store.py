@@ -0,0 +1,53 @@
+import copy
+import json
+import os
+import threading
+
+
+class CommitHistoryStore:
+    def __init__(self, file_name=".commit_history.json") -> None:
+        """
+        Guarda, para cada repositório, o último commit analisado e os contadores da análise de padrão
+        de commits, para que as próximas execuções analisem somente os commits novos.
+
+        Args:
+            file_name (str): Nome do arquivo json onde os dados são salvos.
+        """
+        self.file_name = file_name
+        self.lock = threading.Lock()
+        self.repositories = {}
+        if os.path.exists(file_name):
+            with open(file_name, encoding="utf-8") as file:
+                self.repositories = json.load(file)
+
+    def get(self, repository_name):
+        """
+        Busca uma cópia dos dados salvos de um repositório, que pode ser alterada sem afetar o arquivo
+        sendo salvo por outra thread.
+
+        Args:
+            repository_name (str): Nome do repositório.
+
+        Returns:
+            obj: Objeto com as chaves "last_sha", "last_date", "quantity" e "counters", ou None.
+        """
+        with self.lock:
+            return copy.deepcopy(self.repositories.get(repository_name))
+
+    def set(self, repository_name, history):
+        """
+        Atualiza os dados de um repositório e salva o arquivo de forma atômica.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            history (obj): Objeto com as chaves "last_sha", "last_date", "quantity" e "counters".
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.repositories[repository_name] = copy.deepcopy(history)
+            temporary_file_name = f"{self.file_name}.tmp"
+            with open(temporary_file_name, "w", encoding="utf-8") as file:
+                json.dump(self.repositories, file)
+            os.replace(temporary_file_name, self.file_name)
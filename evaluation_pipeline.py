@@ -0,0 +1,138 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+STOP = object()
+
+
+class EvaluationPipeline:
+    def __init__(self, evaluator, github_workers=8, sonar_workers=1, measure_batch_size=1) -> None:
+        """
+        Pipeline de avaliação em três estágios: coleta no GitHub, análise no SonarQube e escrita dos
+        resultados. Cada estágio de coleta tem seu próprio conjunto de workers, e a escrita é feita
+        por uma única thread, para que o arquivo de saída não seja acessado de forma concorrente.
+
+        Args:
+            evaluator (SonarAndGitEvaluation): Avaliador que fornece as etapas de cada estágio.
+            github_workers (int): Quantidade de repositórios coletados no GitHub ao mesmo tempo.
+            sonar_workers (int): Quantidade de análises do SonarQube executadas ao mesmo tempo.
+            measure_batch_size (int): Quantidade de repositórios cujas métricas do SonarQube são buscadas juntas
+            pela thread de escrita. Com 1, as métricas são buscadas pelo próprio estágio do SonarQube.
+        """
+        self.evaluator = evaluator
+        self.measure_batch_size = measure_batch_size
+        self.github_workers = github_workers
+        self.sonar_workers = sonar_workers
+
+    def run(self, repositories):
+        """
+        Avalia todos os repositórios recebidos, coletados no GitHub em lotes de github_batch_size
+        repositórios. Assim que a coleta do GitHub de um lote termina, cada repositório é enviado para
+        o estágio do SonarQube, e assim que a análise termina, o resultado é enviado para a escrita.
+
+        Args:
+            repositories (list): Lista com os nomes dos repositórios.
+
+        Returns:
+            None
+        """
+        results = queue.Queue()
+        writer = threading.Thread(target=self.write_results, args=(results,))
+        writer.start()
+        try:
+            with ThreadPoolExecutor(self.github_workers) as github_pool, ThreadPoolExecutor(
+                self.sonar_workers
+            ) as sonar_pool:
+                batch_size = self.evaluator.github_batch_size
+                github_futures = {
+                    github_pool.submit(self.evaluator.make_github_evaluations, batch): batch
+                    for batch in (
+                        repositories[start : start + batch_size]
+                        for start in range(0, len(repositories), batch_size)
+                    )
+                }
+                sonar_futures = []
+                for future in as_completed(github_futures):
+                    try:
+                        evaluations = future.result()
+                    except Exception as error:
+                        for repository_name in github_futures[future]:
+                            self.evaluator.fail_evaluation(repository_name, error)
+                        continue
+                    for evaluation in evaluations:
+                        sonar_futures.append(
+                            sonar_pool.submit(self.run_sonar_stage, evaluation, results)
+                        )
+                for future in as_completed(sonar_futures):
+                    future.result()
+        finally:
+            results.put(STOP)
+            writer.join()
+
+    def run_sonar_stage(self, evaluation, results):
+        """
+        Executa a análise do SonarQube de um repositório e envia a avaliação completa para a escrita. Um erro
+        na análise é registrado como falha do repositório.
+
+        Args:
+            evaluation (dict): Avaliação do repositório com os dados do GitHub.
+            results (queue.Queue): Fila consumida pela thread de escrita.
+
+        Returns:
+            None
+        """
+        try:
+            self.evaluator.make_sonar_evaluation(evaluation, self.measure_batch_size == 1)
+        except Exception as error:
+            self.evaluator.fail_evaluation(evaluation["name"], error)
+            return
+        results.put(evaluation)
+
+    def write_results(self, results):
+        """
+        Consome a fila de resultados e escreve cada avaliação no arquivo de saída, até receber o sinal de parada.
+        Quando measure_batch_size é maior que 1, as métricas do SonarQube são buscadas para cada lote de
+        avaliações antes da escrita.
+
+        Args:
+            results (queue.Queue): Fila com as avaliações completas.
+
+        Returns:
+            None
+        """
+        batch = []
+        while True:
+            evaluation = results.get()
+            if evaluation is not STOP:
+                batch.append(evaluation)
+            if batch and (evaluation is STOP or len(batch) >= self.measure_batch_size):
+                self.write_batch(batch)
+                batch = []
+            if evaluation is STOP:
+                return
+
+    def write_batch(self, batch):
+        """
+        Escreve um lote de avaliações, buscando antes as métricas do SonarQube quando measure_batch_size é
+        maior que 1. Se a busca das métricas falhar, todos os repositórios do lote são registrados como falha.
+        Um erro na escrita de uma avaliação é registrado como falha do repositório, sem interromper a thread
+        de escrita.
+
+        Args:
+            batch (list): Lista com as avaliações.
+
+        Returns:
+            None
+        """
+        if self.measure_batch_size > 1:
+            try:
+                self.evaluator.add_sonar_measures(batch)
+            except Exception as error:
+                for evaluation in batch:
+                    self.evaluator.fail_evaluation(evaluation["name"], error)
+                return
+        for evaluation in batch:
+            try:
+                self.evaluator.finish_evaluation(evaluation)
+            except Exception as error:
+                self.evaluator.fail_evaluation(evaluation["name"], error)
@@ -0,0 +1,307 @@
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import RateLimitScheduler
+
+LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+class GitHubClient:
+    def __init__(
+        self,
+        git_token,
+        base_url="https://api.github.com",
+        per_page=100,
+        max_concurrency=8,
+        cache=None,
+    ) -> None:
+        self.base_url = base_url
+        self.cache = cache
+        self.per_page = per_page
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        self.set_pool_size(2 * max_concurrency)
+        self.session.headers.update({"Accept": "application/vnd.github+json"})
+        tokens = [git_token] if isinstance(git_token, str) else list(git_token)
+        self.scheduler = RateLimitScheduler(tokens)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def set_pool_size(self, pool_size):
+        """
+        Define quantas conexões a sessão mantém abertas para reaproveitamento. Deve comportar todas as
+        threads que usam a sessão ao mesmo tempo (os workers de quem chama o cliente e as max_concurrency
+        threads que buscam as páginas), pois as conexões além do limite são descartadas após o uso.
+
+        Args:
+            pool_size (int): Quantidade máxima de conexões mantidas.
+
+        Returns:
+            None
+        """
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, resource="core", headers=None, **kwargs):
+        """
+        Realiza uma requisição com o token escolhido pelo agendador de limites da API, repetindo a
+        requisição quando ela é recusada por limite primário ou secundário.
+
+        Args:
+            method (str): Método HTTP da requisição.
+            url (str): URL completa da requisição.
+            resource (str): Recurso da API consumido pela requisição (core ou graphql).
+            headers (dict): Cabeçalhos adicionais da requisição.
+
+        Returns:
+            requests.Response: Resposta da requisição.
+        """
+        attempt = 0
+        while True:
+            token = self.scheduler.acquire(resource)
+            response = self.session.request(
+                method,
+                url,
+                headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                **kwargs,
+            )
+            if not self.scheduler.update(token, resource, response, attempt):
+                return response
+            attempt += 1
+
+    def get(self, url, params=None, headers=None):
+        """
+        Realiza uma requisição GET reaproveitando as conexões abertas da sessão.
+
+        Args:
+            url (str): URL completa da requisição.
+            params (dict): Parâmetros de consulta da requisição.
+            headers (dict): Cabeçalhos adicionais da requisição.
+
+        Returns:
+            requests.Response: Resposta da requisição.
+        """
+        response = self.request("GET", url, params=params, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def get_page(self, url, params=None):
+        """
+        Busca uma página de um endpoint. Se houver cache, envia If-None-Match/If-Modified-Since
+        com os validadores salvos, e uma resposta 304 é atendida com o corpo do cache.
+
+        Args:
+            url (str): URL completa da requisição.
+            params (dict): Parâmetros de consulta da requisição.
+
+        Returns:
+            tuple: Corpo da resposta já convertido de JSON e dicionário com os links de paginação.
+        """
+        if self.cache is None:
+            response = self.get(url, params)
+            return response.json(), self.parse_link_header(response.headers.get("Link"))
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self.cache.make_key(full_url)
+        entry = self.cache.get(key)
+        response = self.get(full_url, headers=self.get_conditional_headers(entry))
+
+        if response.status_code == 304 and entry is not None:
+            return entry["body"], self.parse_link_header(entry["link"])
+
+        body = response.json()
+        self.store_response(key, response, body)
+        return body, self.parse_link_header(response.headers.get("Link"))
+
+    def post_graphql(self, query):
+        """
+        Realiza uma consulta à API GraphQL do GitHub. As respostas passam pelo mesmo cache das
+        requisições GET, sendo reaproveitadas quando o servidor responde 304 aos validadores enviados.
+
+        Args:
+            query (str): Consulta GraphQL.
+
+        Returns:
+            dict: Corpo da resposta convertido de JSON.
+        """
+        url = f"{self.base_url}/graphql"
+        body = {"query": query}
+        key = entry = None
+        if self.cache is not None:
+            key = self.cache.make_key(url, body)
+            entry = self.cache.get(key)
+
+        response = self.request(
+            "POST",
+            url,
+            resource="graphql",
+            json=body,
+            headers=self.get_conditional_headers(entry),
+        )
+        if response.status_code == 304 and entry is not None:
+            return entry["body"]
+        response.raise_for_status()
+
+        result = response.json()
+        if key is not None:
+            self.store_response(key, response, result)
+        return result
+
+    def get_conditional_headers(self, entry):
+        """
+        Monta os cabeçalhos de requisição condicional a partir de uma entrada do cache.
+
+        Args:
+            entry (dict): Entrada do cache, ou None.
+
+        Returns:
+            dict: Cabeçalhos If-None-Match e If-Modified-Since disponíveis.
+        """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store_response(self, key, response, body):
+        """
+        Salva no cache uma resposta que possua ETag ou Last-Modified.
+
+        Args:
+            key (str): Chave da entrada no cache.
+            response (requests.Response): Resposta da requisição.
+            body (list|dict): Corpo da resposta convertido de JSON.
+
+        Returns:
+            None
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return
+        self.cache.set(
+            key,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "link": response.headers.get("Link"),
+                "body": body,
+            },
+        )
+
+    def get_all(self, path, params=None):
+        """
+        Busca todas as páginas de um endpoint paginado e retorna os registros em uma única lista.
+
+        Args:
+            path (str): Caminho do endpoint, relativo à base_url.
+            params (dict): Parâmetros de consulta adicionais.
+
+        Returns:
+            list: Lista com os registros de todas as páginas, na ordem da API.
+        """
+        return list(self.iter_items(path, params))
+
+    def iter_items(self, path, params=None, extract=None):
+        """
+        Percorre os registros de um endpoint paginado, página a página, na ordem da API, sem manter
+        todas as páginas em memória. Quando o cabeçalho Link informa a última página, as próximas
+        páginas são buscadas de forma concorrente, com no máximo max_concurrency páginas buscadas
+        à frente da que está sendo lida. Caso contrário, segue o rel="next" página a página. Se a leitura
+        for interrompida, as páginas ainda não iniciadas são canceladas.
+
+        Args:
+            path (str): Caminho do endpoint, relativo à base_url.
+            params (dict): Parâmetros de consulta adicionais.
+            extract (Callable): Função aplicada a cada registro assim que a página é recebida, para
+            manter somente os campos usados. Por padrão, os registros são mantidos inteiros.
+
+        Returns:
+            Iterator: Registros do endpoint, ou o resultado de extract para cada registro.
+        """
+        url = f"{self.base_url}/{path}"
+        params = {**(params or {}), "per_page": self.per_page}
+
+        def get_items(page_url, page_params=None):
+            body, links = self.get_page(page_url, page_params)
+            if extract is not None:
+                body = [extract(item) for item in body]
+            return body, links
+
+        items, links = get_items(url, {**params, "page": 1})
+        yield from items
+
+        if "last" in links:
+            last_page = self.get_page_number(links["last"])
+            pending = deque()
+            next_page = 2
+            try:
+                while next_page <= last_page or pending:
+                    while next_page <= last_page and len(pending) < self.max_concurrency:
+                        pending.append(
+                            self.executor.submit(get_items, url, {**params, "page": next_page})
+                        )
+                        next_page += 1
+                    yield from pending.popleft().result()[0]
+            finally:
+                for future in pending:
+                    future.cancel()
+            return
+
+        while "next" in links:
+            items, links = get_items(links["next"])
+            yield from items
+
+    def count(self, path, params=None):
+        """
+        Conta os registros de um endpoint paginado com uma única requisição, pedindo um registro
+        por página e lendo o número da última página no cabeçalho Link.
+
+        Args:
+            path (str): Caminho do endpoint, relativo à base_url.
+            params (dict): Parâmetros de consulta adicionais.
+
+        Returns:
+            int: Quantidade de registros do endpoint.
+        """
+        body, links = self.get_page(
+            f"{self.base_url}/{path}", {**(params or {}), "per_page": 1}
+        )
+        if "last" in links:
+            return self.get_page_number(links["last"])
+        return len(body)
+
+    def parse_link_header(self, link_header):
+        """
+        Interpreta o cabeçalho Link de paginação da API do GitHub.
+
+        Args:
+            link_header (str): Valor do cabeçalho Link, ou None.
+
+        Returns:
+            dict: Dicionário com o rel como chave (next, last, prev, first) e a URL como valor.
+        """
+        if not link_header:
+            return {}
+        return {rel: url for url, rel in LINK_PATTERN.findall(link_header)}
+
+    def get_page_number(self, url):
+        """
+        Extrai o número da página de uma URL de paginação.
+
+        Args:
+            url (str): URL com o parâmetro page.
+
+        Returns:
+            int: Número da página.
+        """
+        return int(parse_qs(urlparse(url).query)["page"][0])
@@ -0,0 +1,193 @@
+import json
+
+PAGE_SIZE = 100
+
+REPOSITORY_FIELDS = """
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { nodes { name } }
+    pullRequests(states: OPEN) { totalCount }
+    defaultBranchRef {
+        target {
+            ... on Commit {
+                history(first: %(page_size)d) {
+                    totalCount
+                    nodes { message }
+                    pageInfo { hasNextPage endCursor }
+                }
+            }
+        }
+    }
+"""
+
+REFS_FIELDS = """
+    refs(refPrefix: "refs/heads/", first: %(page_size)d) {
+        nodes { name }
+        pageInfo { hasNextPage endCursor }
+    }
+"""
+
+REFS_PAGE = """
+    refs(refPrefix: "refs/heads/", first: %(page_size)d, after: %(cursor)s) {
+        nodes { name }
+        pageInfo { hasNextPage endCursor }
+    }
+"""
+
+HISTORY_PAGE = """
+    defaultBranchRef {
+        target {
+            ... on Commit {
+                history(first: %(page_size)d, after: %(cursor)s) {
+                    nodes { message }
+                    pageInfo { hasNextPage endCursor }
+                }
+            }
+        }
+    }
+"""
+
+
+class GraphQLCollector:
+    def __init__(self, github_client, organization_name, batch_size=10, include_branches=True) -> None:
+        """
+        Coleta os dados de vários repositórios do GitHub em uma única consulta GraphQL, usando um alias
+        por repositório. Somente os repositórios com mais branches ou commits do que cabem na primeira
+        página recebem novas consultas, também agrupadas, com paginação por cursor.
+
+        Args:
+            github_client (GitHubClient): Cliente usado para as consultas GraphQL.
+            organization_name (str): Nome da organização ou usuário dono dos repositórios.
+            batch_size (int): Quantidade de repositórios consultados em cada requisição.
+            include_branches (bool): Se os nomes das branches são consultados. Com False, a chave "branches"
+            não é retornada, e as branches devem ser buscadas de outra forma.
+        """
+        self.github_client = github_client
+        self.organization_name = organization_name
+        self.batch_size = batch_size
+        self.include_branches = include_branches
+
+    def collect(self, repository_names):
+        """
+        Busca linguagens, quantidade de pull requests abertos, nomes das branches e histórico de commits
+        da branch padrão de cada repositório. Um repositório renomeado, removido ou inacessível não
+        interrompe a consulta dos demais repositórios do lote.
+
+        Args:
+            repository_names (list): Lista com os nomes dos repositórios.
+
+        Returns:
+            tuple: Dicionário com o nome do repositório como chave e um objeto com as chaves "languages",
+            "quantity_of_pull_requests", "branches" (se include_branches), "commit_messages" e
+            "quantity_of_commits" como valor, e dicionário com o nome de cada repositório que falhou como
+            chave e a mensagem de erro como valor.
+        """
+        result = {}
+        errors = {}
+        for start in range(0, len(repository_names), self.batch_size):
+            batch_result, batch_errors = self.collect_batch(
+                repository_names[start : start + self.batch_size]
+            )
+            result.update(batch_result)
+            errors.update(batch_errors)
+        return result, errors
+
+    def collect_batch(self, repository_names):
+        aliases = {f"r{index}": name for index, name in enumerate(repository_names)}
+        fields = REPOSITORY_FIELDS + (REFS_FIELDS if self.include_branches else "")
+        data, alias_errors = self.query(
+            {alias: fields % {"page_size": PAGE_SIZE} for alias in aliases},
+            aliases,
+        )
+
+        result = {}
+        errors = {}
+        refs_cursors = {}
+        history_cursors = {}
+        for alias, name in aliases.items():
+            repository = data.get(alias)
+            if repository is None:
+                errors[name] = alias_errors.get(alias, f"Repositório {name} não encontrado")
+                continue
+            history = self.get_history(repository)
+            result[name] = {
+                "languages": [language["name"] for language in repository["languages"]["nodes"]],
+                "quantity_of_pull_requests": repository["pullRequests"]["totalCount"],
+                "commit_messages": [commit["message"] for commit in history["nodes"]],
+                "quantity_of_commits": history.get("totalCount", 0),
+            }
+            if self.include_branches:
+                result[name]["branches"] = [ref["name"] for ref in repository["refs"]["nodes"]]
+                self.add_cursor(refs_cursors, alias, repository["refs"])
+            self.add_cursor(history_cursors, alias, history)
+
+        while refs_cursors or history_cursors:
+            fields = {}
+            for alias, cursor in refs_cursors.items():
+                fields[f"{alias}_refs"] = REFS_PAGE % {"page_size": PAGE_SIZE, "cursor": cursor}
+            for alias, cursor in history_cursors.items():
+                fields[f"{alias}_history"] = HISTORY_PAGE % {"page_size": PAGE_SIZE, "cursor": cursor}
+            page_aliases = {field: aliases[field.rsplit("_", 1)[0]] for field in fields}
+            data, alias_errors = self.query(fields, page_aliases)
+            for field, name in page_aliases.items():
+                if data.get(field) is None and name in result:
+                    errors[name] = alias_errors.get(field, f"Repositório {name} não encontrado")
+                    del result[name]
+
+            next_refs_cursors = {}
+            for alias in refs_cursors:
+                if aliases[alias] in errors:
+                    continue
+                refs = data[f"{alias}_refs"]["refs"]
+                result[aliases[alias]]["branches"] += [ref["name"] for ref in refs["nodes"]]
+                self.add_cursor(next_refs_cursors, alias, refs)
+            next_history_cursors = {}
+            for alias in history_cursors:
+                if aliases[alias] in errors:
+                    continue
+                history = self.get_history(data[f"{alias}_history"])
+                result[aliases[alias]]["commit_messages"] += [
+                    commit["message"] for commit in history["nodes"]
+                ]
+                self.add_cursor(next_history_cursors, alias, history)
+            refs_cursors = next_refs_cursors
+            history_cursors = next_history_cursors
+
+        return result, errors
+
+    def query(self, fields, aliases):
+        """
+        Monta e executa uma consulta com um campo repository para cada alias. Erros que apontam para um
+        alias (como um repositório não encontrado) são retornados junto dos dados; os demais erros
+        interrompem a consulta.
+
+        Args:
+            fields (dict): Dicionário com o alias como chave e os campos consultados como valor.
+            aliases (dict): Dicionário com o alias como chave e o nome do repositório como valor.
+
+        Returns:
+            tuple: Conteúdo da chave "data" da resposta, indexado pelos aliases, e dicionário com o alias
+            como chave e a mensagem de erro como valor.
+        """
+        owner = json.dumps(self.organization_name)
+        query = "{" + "".join(
+            f"{alias}: repository(owner: {owner}, name: {json.dumps(aliases[alias])}) {{{body}}}"
+            for alias, body in fields.items()
+        ) + "}"
+        response = self.github_client.post_graphql(query)
+        alias_errors = {}
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            if not path or path[0] not in fields or response.get("data") is None:
+                raise RuntimeError(f"Erro na consulta GraphQL: {response['errors']}")
+            alias_errors.setdefault(path[0], error.get("message", str(error)))
+        return response["data"], alias_errors
+
+    def get_history(self, repository):
+        branch = repository.get("defaultBranchRef")
+        if branch is None:
+            return {"nodes": [], "pageInfo": {"hasNextPage": False}}
+        return branch["target"]["history"]
+
+    def add_cursor(self, cursors, alias, connection):
+        page_info = connection["pageInfo"]
+        if page_info["hasNextPage"]:
+            cursors[alias] = json.dumps(page_info["endCursor"])
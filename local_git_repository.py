@@ -0,0 +1,198 @@
+import base64
+import os
+import subprocess
+import tempfile
+
+READ_SIZE = 64 * 1024
+
+
+def get_git_environment(git_token=None):
+    """
+    Monta as variáveis de ambiente dos comandos do git que acessam o GitHub. O git nunca pede credenciais
+    no terminal (GIT_TERMINAL_PROMPT=0), e, com um token, o cabeçalho de autenticação é passado pela
+    configuração http.extraheader em variáveis GIT_CONFIG_*, sem aparecer na linha de comando nem ser
+    salvo na configuração dos clones.
+
+    Args:
+        git_token (str): Token do GitHub, ou None para acessar somente repositórios públicos.
+
+    Returns:
+        dict: Variáveis de ambiente do processo do git.
+    """
+    environment = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    if git_token:
+        credentials = base64.b64encode(f"x-access-token:{git_token}".encode("utf-8")).decode("ascii")
+        count = int(environment.get("GIT_CONFIG_COUNT", 0))
+        environment["GIT_CONFIG_COUNT"] = str(count + 1)
+        environment[f"GIT_CONFIG_KEY_{count}"] = "http.extraheader"
+        environment[f"GIT_CONFIG_VALUE_{count}"] = f"Authorization: Basic {credentials}"
+    return environment
+
+
+def get_remote_head(github_url, git_token=None):
+    """
+    Busca o SHA do commit apontado pelo HEAD do repositório remoto, com uma única consulta do git ls-remote,
+    sem clonar o repositório.
+
+    Args:
+        github_url (str): URL do repositório GitHub.
+        git_token (str): Token do GitHub, necessário para repositórios privados.
+
+    Returns:
+        str: SHA do commit, ou None se o repositório estiver vazio.
+    """
+    result = subprocess.run(
+        ["git", "ls-remote", github_url, "HEAD"],
+        check=True,
+        capture_output=True,
+        env=get_git_environment(git_token),
+    )
+    output = result.stdout.decode("utf-8").split()
+    return output[0] if output else None
+
+
+def get_remote_branch_names(github_url, git_token=None):
+    """
+    Lista os nomes de todas as branches do repositório remoto com uma única consulta do git ls-remote,
+    sem clonar o repositório e sem paginação.
+
+    Args:
+        github_url (str): URL do repositório GitHub.
+        git_token (str): Token do GitHub, necessário para repositórios privados.
+
+    Returns:
+        list: Lista com os nomes das branches.
+    """
+    result = subprocess.run(
+        ["git", "ls-remote", "--heads", github_url],
+        check=True,
+        capture_output=True,
+        env=get_git_environment(git_token),
+    )
+    return [
+        line.split("\t", 1)[1].removeprefix("refs/heads/")
+        for line in result.stdout.decode("utf-8", errors="replace").splitlines()
+        if "\t" in line
+    ]
+
+
+class LocalGitRepository:
+    def __init__(self, path, git_token=None) -> None:
+        """
+        Lê commits e branches de um clone local de um repositório, através do git, sem usar a API do GitHub.
+
+        Args:
+            path (str): Caminho do clone bare do repositório.
+            git_token (str): Token do GitHub usado no clone e no fetch, necessário para repositórios privados.
+        """
+        self.path = path
+        self.environment = get_git_environment(git_token)
+
+    def update(self, github_url, clone_filter="blob:none", depth=None):
+        """
+        Cria um clone bare do repositório, ou, se o clone já existir, busca somente as alterações das
+        branches. Por padrão o clone é parcial (--filter=blob:none), e o conteúdo dos arquivos só é
+        baixado quando algum checkout precisar dele.
+
+        Args:
+            github_url (str): URL do repositório GitHub.
+            clone_filter (str): Filtro do clone parcial, ou None para um clone completo.
+            depth (int): Profundidade do histórico para um clone raso, ou None para o histórico completo.
+
+        Returns:
+            None
+        """
+        depth_args = ["--depth", str(depth)] if depth else []
+        if os.path.exists(self.path):
+            self.run_git("fetch", "--prune", *depth_args, "origin")
+            return
+        filter_args = [f"--filter={clone_filter}"] if clone_filter else []
+        subprocess.run(
+            ["git", "clone", "--bare", *filter_args, *depth_args, github_url, self.path],
+            check=True,
+            capture_output=True,
+            env=self.environment,
+        )
+        self.run_git("config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+
+    def add_worktree(self, path, revision="HEAD"):
+        """
+        Faz o checkout de uma revisão do clone em uma pasta de trabalho separada, sem copiar o histórico.
+
+        Args:
+            path (str): Pasta onde os arquivos serão colocados, que não deve existir.
+            revision (str): Revisão usada no checkout.
+
+        Returns:
+            None
+        """
+        self.run_git("worktree", "prune")
+        self.run_git("worktree", "add", "--detach", "--force", os.path.abspath(path), revision)
+
+    def run_git(self, *args):
+        """
+        Executa um comando do git no clone.
+
+        Args:
+            args (str): Argumentos do comando.
+
+        Returns:
+            str: Saída do comando.
+        """
+        result = subprocess.run(
+            ["git", "--git-dir", self.path, *args],
+            check=True,
+            capture_output=True,
+            env=self.environment,
+        )
+        return result.stdout.decode("utf-8", errors="replace")
+
+    def iter_commit_messages(self, revision="HEAD"):
+        """
+        Lê as mensagens dos commits da branch padrão, do mais recente para o mais antigo, à medida que o
+        git log as escreve, sem carregar o histórico inteiro em memória. Se o git log falhar (clone
+        inexistente ou corrompido, ou repositório sem commits), é lançado um CalledProcessError com a
+        saída de erro do git.
+
+        Args:
+            revision (str): Revisão a partir da qual o histórico é lido.
+
+        Returns:
+            Iterator[str]: Mensagens de commit.
+        """
+        command = ["git", "--git-dir", self.path, "log", "-z", "--format=%B", revision]
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=stderr, env=self.environment
+            )
+            finished = False
+            try:
+                pending = b""
+                while True:
+                    chunk = process.stdout.read(READ_SIZE)
+                    if not chunk:
+                        break
+                    *messages, pending = (pending + chunk).split(b"\0")
+                    for message in messages:
+                        yield message.decode("utf-8", errors="replace").rstrip("\n")
+                if pending:
+                    yield pending.decode("utf-8", errors="replace").rstrip("\n")
+                finished = True
+            finally:
+                process.stdout.close()
+                process.wait()
+            if finished and process.returncode != 0:
+                stderr.seek(0)
+                raise subprocess.CalledProcessError(
+                    process.returncode, command, stderr=stderr.read()
+                )
+
+    def get_branch_names(self):
+        """
+        Lista os nomes das branches do clone.
+
+        Returns:
+            list: Lista com os nomes das branches.
+        """
+        output = self.run_git("for-each-ref", "--format=%(refname:lstrip=2)", "refs/heads")
+        return output.splitlines()
@@ -1,50 +1,377 @@
-import requests
 import os
 import dotenv
 import re
-from typing import List
-import csv
-import emoji
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Iterable
 from sonar_evaluations import SonarEvaluations
+from github_client import GitHubClient
+from response_cache import ResponseCache
+from graphql_collector import GraphQLCollector
+from commit_history_store import CommitHistoryStore
+from commit_classifier import CommitClassifier
+from clone_cache import CloneCache
+from sonar_task_tracker import CeTaskTracker
+from sonar_measures import SonarMeasuresClient
+from sonar_result_cache import SonarResultCache
+from local_git_repository import get_remote_branch_names, get_remote_head
+from evaluation_pipeline import EvaluationPipeline
+from output_sinks import create_sink
+from checkpoint_journal import CheckpointJournal
+from project_cards import ProjectCardIndex
+from run_metrics import RunMetrics
+from scan_scope import ScanScope
+from sonar_project_manager import SonarProjectManager
+from repository_scheduler import RepositoryScheduler
+from sharding import check_shard, filter_shard, get_shard_file_name
 
 dotenv.load_dotenv("./.env", override=True)
 
+GIT_FLOW_PATTERN = re.compile(r"(feature|develop|master|main)")
+
 class SonarAndGitEvaluation:
     def __init__(
-        self, org_or_user, output_file_name, git_token, sonar_token, has_project=False
+        self,
+        org_or_user,
+        output_file_name,
+        git_token,
+        sonar_token,
+        has_project=False,
+        cache_directory=None,
+        github_source="rest",
+        commit_history_file=None,
+        commit_rule_set="conventional",
+        local_clone_directory=".local_clones",
+        clone_cache=None,
+        scanner=None,
+        tracker=None,
+        sonar_result_cache_directory=None,
+        force_refresh=False,
+        output_formats=("csv",),
+        flush_every=50,
+        journal_file=None,
+        metrics=None,
+        run_report_file=None,
+        prometheus_file=None,
+        base_url="https://api.github.com",
+        clone_base_url="https://github.com",
+        sonar_url="http://localhost:9000",
+        branch_source="ls-remote",
+        scan_scope=None,
+        analysis_retention=None,
+        prune_projects=False,
+        sonar_projects_file=".sonar_projects.json",
+        scheduler=None,
+        shard_index=0,
+        shard_count=1,
     ) -> None:
-        self.base_url = "https://api.github.com"
+        check_shard(shard_index, shard_count)
+        if shard_count > 1 and scanner is None:
+            raise ValueError(
+                "Sem o parâmetro scanner, as análises usam a pasta github_repository e o arquivo "
+                "sonar-project.properties do diretório atual, e as partições não podem ser executadas."
+            )
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        if shard_count > 1:
+            output_file_name = get_shard_file_name(output_file_name, shard_index, shard_count)
+            if journal_file:
+                journal_file = get_shard_file_name(journal_file, shard_index, shard_count)
+            if run_report_file:
+                run_report_file = get_shard_file_name(run_report_file, shard_index, shard_count)
+            if prometheus_file:
+                prometheus_file = get_shard_file_name(prometheus_file, shard_index, shard_count)
+            if commit_history_file:
+                commit_history_file = get_shard_file_name(commit_history_file, shard_index, shard_count)
+            if sonar_projects_file:
+                sonar_projects_file = get_shard_file_name(sonar_projects_file, shard_index, shard_count)
+            local_clone_directory = get_shard_file_name(local_clone_directory, shard_index, shard_count)
+        self.base_url = base_url
+        self.clone_base_url = clone_base_url
         self.organization_name = org_or_user
         self.git_token = git_token
         self.sonar_token = sonar_token
         self.output_file_name = output_file_name
         self.has_project = has_project
-        self.create_csv()
-
-    def make_many_evaluations(self):
+        cache = ResponseCache(cache_directory) if cache_directory else None
+        self.github_client = GitHubClient(git_token, self.base_url, cache=cache)
+        self.github_source = github_source
+        self.commit_classifier = CommitClassifier(commit_rule_set)
+        self.git_credential = git_token if isinstance(git_token, str) else list(git_token)[0]
+        self.clone_cache = clone_cache or CloneCache(
+            local_clone_directory, git_token=self.git_credential
+        )
+        self.scanner = scanner
+        self.scan_scope = scan_scope or ScanScope()
+        self.tracker = tracker or CeTaskTracker(sonar_token, sonar_url)
+        self.sonar_measures = SonarMeasuresClient(sonar_token, sonar_url)
+        self.sonar_projects = SonarProjectManager(
+            self.sonar_measures, analysis_retention, org_or_user, sonar_projects_file
+        )
+        self.prune_projects = prune_projects
+        self.scheduler = scheduler or RepositoryScheduler()
+        if shard_count > 1 and self.scheduler.state_file:
+            self.scheduler.set_state_file(
+                get_shard_file_name(self.scheduler.state_file, shard_index, shard_count)
+            )
+        self.sonar_result_cache = (
+            SonarResultCache(sonar_result_cache_directory)
+            if sonar_result_cache_directory
+            else None
+        )
+        self.force_refresh = force_refresh
+        self.sonar_result_cache_keys = {}
+        self.commit_history = (
+            CommitHistoryStore(commit_history_file) if commit_history_file else None
+        )
+        self.branch_source = branch_source
+        self.graphql_collector = GraphQLCollector(
+            self.github_client, org_or_user, include_branches=branch_source == "api"
+        )
+        self.project_cards = ProjectCardIndex(self.github_client, org_or_user)
+        self.github_batch_size = (
+            self.graphql_collector.batch_size if github_source == "graphql" else 1
+        )
+        self.output_formats = output_formats
+        self.flush_every = flush_every
+        self.journal = CheckpointJournal(journal_file) if journal_file else None
+        self.failures = {}
+        self.metrics = metrics or RunMetrics()
+        self.run_report_file = run_report_file
+        self.prometheus_file = prometheus_file
+        self.metrics.track_session(self.github_client.session, "github")
+        self.metrics.track_session(self.sonar_measures.session, "sonar")
+        self.metrics.track_session(self.tracker.session, "sonar")
+        self.create_outputs()
+
+    def make_many_evaluations(
+        self,
+        github_workers=8,
+        sonar_workers=1,
+        measure_batch_size=1,
+        resume=False,
+        retry_failed_only=False,
+    ):
         """
         Realiza a avaliação de diversos repositórios baseado nas funções da classe, adiciona cada critério
-        em uma chave de objeto, e chama funções para criar e salvar novos registros no arquivo csv.
+        em uma chave de objeto, e chama funções para criar e salvar novos registros nas saídas.
+        A coleta no GitHub, a análise no SonarQube e a escrita das saídas são executadas em estágios paralelos.
+        Um erro na avaliação de um repositório é registrado em failures (e no diário, se houver) sem
+        interromper os demais. Com shard_count maior que 1, somente os repositórios da partição shard_index
+        são avaliados.
+
+        Args:
+            github_workers (int): Quantidade de repositórios coletados no GitHub ao mesmo tempo.
+            sonar_workers (int): Quantidade de análises do SonarQube executadas ao mesmo tempo. Sem o parâmetro
+            scanner, todas as análises compartilham a pasta github_repository e o arquivo
+            sonar-project.properties, e deve ser 1; caso contrário, é lançado um ValueError.
+            measure_batch_size (int): Quantidade de repositórios cujas métricas do SonarQube são buscadas em uma
+            mesma requisição (api/measures/search). Com 1, as métricas são buscadas logo após cada análise.
+            resume (bool): Retoma a execução registrada no diário (journal_file): as avaliações já concluídas
+            são copiadas para as saídas e somente os demais repositórios são avaliados.
+            retry_failed_only (bool): Junto com resume, avalia somente os repositórios que falharam.
         """
+        if self.scanner is None and sonar_workers > 1:
+            raise ValueError(
+                "Sem o parâmetro scanner, as análises compartilham a pasta github_repository e "
+                "sonar_workers deve ser 1."
+            )
+        self.github_client.set_pool_size(github_workers + self.github_client.max_concurrency)
         self.repositories: list = self.get_repositories()
+        if self.prune_projects:
+            self.repositories = [
+                name for name in self.repositories if name not in self.archived_repositories
+            ]
+            self.sonar_projects.prune(self.repositories)
+        if self.shard_count > 1:
+            self.repositories = filter_shard(self.repositories, self.shard_index, self.shard_count)
         if self.has_project:
-            self.projects: list = self.get_cards_of_projects()
+            self.projects: dict = self.get_cards_of_projects()
+
+        try:
+            self.repositories = self.schedule_repositories(self.repositories)
+            pending = self.get_pending_repositories(resume, retry_failed_only)
+            pipeline = EvaluationPipeline(self, github_workers, sonar_workers, measure_batch_size)
+            pipeline.run(pending)
+        finally:
+            self.close_outputs()
+            self.write_run_report()
+
+    def schedule_repositories(self, repository_names):
+        """
+        Aplica o scheduler aos repositórios: remove os ignorados pelas regras configuradas, escreve nas saídas
+        a avaliação anterior dos que não mudaram (com pull requests e cards atualizados) e ordena os demais
+        do maior para o menor.
 
-        for repository in self.repositories:
-            self.make_evaluation(repository)
+        Args:
+            repository_names (list): Lista com os nomes dos repositórios.
 
-    def make_evaluation(self, repository_name):
-        evaluation = {"name": repository_name}
-        evaluation["languages"] = self.get_languages_of_repository(repository_name)
+        Returns:
+            list: Lista com os nomes dos repositórios que serão avaliados, na ordem de avaliação.
+        """
+        scheduled = self.scheduler.schedule(
+            [self.repository_metadata[name] for name in repository_names]
+        )
+        for reason in self.scheduler.skipped.values():
+            self.metrics.increment(f"repositories_skipped_{reason}")
+        with ThreadPoolExecutor(self.github_client.max_concurrency) as executor:
+            futures = {
+                executor.submit(self.refresh_unchanged_evaluation, evaluation): evaluation["name"]
+                for evaluation in self.scheduler.get_unchanged_evaluations()
+            }
+            for future, repository_name in futures.items():
+                try:
+                    self.add_record(future.result())
+                except Exception as error:
+                    self.fail_evaluation(repository_name, error)
+        return scheduled
+
+    def refresh_unchanged_evaluation(self, evaluation):
+        """
+        Atualiza, na avaliação anterior de um repositório sem push, os critérios que mudam sem push: a
+        quantidade de pull requests abertos e os cards do projeto. Commits, branches, linguagens e métricas
+        do SonarQube são reaproveitados.
+
+        Args:
+            evaluation (dict): Avaliação anterior do repositório.
+
+        Returns:
+            dict: Nova avaliação do repositório.
+        """
+        evaluation = dict(evaluation)
         evaluation["quantity_of_pull_requests"] = self.get_quantity_of_pull_requests(
-            repository_name
+            evaluation["name"]
         )
-        branches = self.get_branches(repository_name)
+        if self.has_project:
+            evaluation["cards"] = self.check_project_in_repositories(evaluation["name"])
+        return evaluation
+
+    def write_run_report(self):
+        """
+        Salva o relatório de métricas da execução nos arquivos configurados (run_report_file em JSON e
+        prometheus_file no formato de texto do Prometheus).
+
+        Returns:
+            dict: Relatório da execução.
+        """
+        labels = {"shard": str(self.shard_index)} if self.shard_count > 1 else None
+        return self.metrics.write_report(self.run_report_file, self.prometheus_file, labels)
+
+    def get_pending_repositories(self, resume, retry_failed_only):
+        """
+        Define quais repositórios ainda precisam ser avaliados. Ao retomar uma execução, as avaliações
+        concluídas registradas no diário são escritas novamente nas saídas.
+
+        Args:
+            resume (bool): Se a execução registrada no diário deve ser retomada.
+            retry_failed_only (bool): Se somente os repositórios que falharam devem ser avaliados.
+
+        Returns:
+            list: Lista com os nomes dos repositórios que serão avaliados.
+        """
+        if self.journal is None:
+            return self.repositories
+        if not resume:
+            self.journal.reset()
+            return self.repositories
+
+        entries = self.journal.load()
+        pending = []
+        for repository_name in self.repositories:
+            entry = entries.get(repository_name)
+            if entry is not None and entry["status"] == "done":
+                self.add_record(entry["evaluation"])
+            elif not retry_failed_only or entry is not None:
+                pending.append(repository_name)
+        return pending
+
+    def finish_evaluation(self, evaluation):
+        """
+        Escreve a avaliação completa de um repositório nas saídas e a registra no diário.
+
+        Args:
+            evaluation (dict): Avaliação do repositório.
+        """
+        with self.metrics.measure(evaluation["name"], "write"):
+            self.add_record(evaluation)
+            if self.journal:
+                self.journal.record_success(evaluation)
+            self.scheduler.record(evaluation)
+        self.metrics.increment("repositories_done")
+
+    def fail_evaluation(self, repository_name, error):
+        """
+        Registra o erro que interrompeu a avaliação de um repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            error (Exception): Erro ocorrido.
+        """
+        message = f"{type(error).__name__}: {error}"
+        self.failures[repository_name] = message
+        self.metrics.increment("repositories_failed")
+        if self.journal:
+            self.journal.record_failure(repository_name, message)
+
+    def make_evaluation(self, repository_name):
+        evaluation = self.make_github_evaluation(repository_name)
+        self.make_sonar_evaluation(evaluation)
+        self.add_record(evaluation)
+
+    def make_github_evaluations(self, repository_names):
+        """
+        Avalia os critérios de vários repositórios que dependem somente da API do GitHub. Quando a fonte
+        de dados é "graphql", os dados de todos os repositórios são buscados em consultas agrupadas, e os
+        repositórios que a consulta não encontrou são registrados como falha e não são retornados.
+
+        Args:
+            repository_names (list): Lista com os nomes dos repositórios que serão avaliados.
+
+        Returns:
+            list: Lista de objetos com as avaliações dos repositórios feitas com dados do GitHub.
+        """
+        if self.github_source == "graphql":
+            start = time.perf_counter()
+            github_data, errors = self.graphql_collector.collect(repository_names)
+            elapsed = time.perf_counter() - start
+            for name in repository_names:
+                self.metrics.add_phase(name, "fetch", elapsed / len(repository_names))
+            for name, message in errors.items():
+                self.fail_evaluation(name, RuntimeError(f"Erro na consulta GraphQL: {message}"))
+            return [
+                self.make_github_evaluation(name, github_data[name])
+                for name in repository_names
+                if name in github_data
+            ]
+        return [self.make_github_evaluation(name) for name in repository_names]
+
+    def make_github_evaluation(self, repository_name, github_data=None):
+        """
+        Avalia os critérios do repositório que dependem somente da API do GitHub.
+
+        Args:
+            repository_name (str): Nome do repositório que será avaliado.
+            github_data (obj): Dados do repositório já coletados, no formato retornado por get_github_data.
+
+        Returns:
+            obj: Objeto com as avaliações do repositório feitas com dados do GitHub.
+        """
+        if github_data is None:
+            github_data = self.get_github_data(repository_name)
+        evaluation = {"name": repository_name}
+        evaluation["languages"] = self.filter_languages(github_data["languages"])
+        evaluation["quantity_of_pull_requests"] = github_data["quantity_of_pull_requests"]
+        branches = github_data.get("branches")
+        if branches is None:
+            branches = self.get_branches(repository_name)
         evaluation["has_git_flow"] = self.check_git_flow(branches)
-        commits = self.get_commits(repository_name)
-        commits_info = self.get_commits_information(commits)
-        evaluation["quantity_of_commits"] = commits_info["quantity"]
-        commits_checked = self.check_commit_pattern(commits_info["commit_messages"])
+        if isinstance(branches, Generator):
+            branches.close()
+        evaluation["quantity_of_commits"] = github_data["quantity_of_commits"]
+        if "commit_counters" in github_data:
+            commits_checked = self.summarize_commit_pattern(github_data["commit_counters"])
+        else:
+            commits_checked = self.check_commit_pattern(github_data["commit_messages"])
         evaluation["commit_pattern_percent"] = commits_checked[
             "percentage_of_commits_with_pattern"
         ]
@@ -53,14 +380,216 @@ class SonarAndGitEvaluation:
         ]
         if self.has_project:
             evaluation["cards"] = self.check_project_in_repositories(repository_name)
+        return evaluation
+
+    def get_github_data(self, repository_name):
+        """
+        Busca os dados do repositório usados na avaliação, pela fonte de dados configurada. O tempo da
+        busca é registrado na etapa fetch e, na fonte "local", a atualização do clone na etapa clone, sem
+        sobreposição entre as duas.
+
+        Args:
+            repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
+
+        Returns:
+            obj: Objeto com as chaves "languages", "quantity_of_pull_requests", "branches",
+            "quantity_of_commits" e "commit_messages", ou "commit_counters" no modo incremental.
+        """
+        if self.github_source == "local":
+            with self.metrics.measure(repository_name, "clone"):
+                repository = self.get_local_repository(repository_name)
+            with self.metrics.measure(repository_name, "fetch"):
+                commits_info = self.count_commit_stream(repository.iter_commit_messages())
+                return {
+                    "languages": self.get_languages_of_repository(repository_name),
+                    "quantity_of_pull_requests": self.get_quantity_of_pull_requests(
+                        repository_name
+                    ),
+                    "branches": repository.get_branch_names(),
+                    "commit_counters": commits_info["counters"],
+                    "quantity_of_commits": commits_info["quantity"],
+                }
+
+        with self.metrics.measure(repository_name, "fetch"):
+            if self.github_source == "graphql":
+                github_data, errors = self.graphql_collector.collect([repository_name])
+                if repository_name in errors:
+                    raise RuntimeError(f"Erro na consulta GraphQL: {errors[repository_name]}")
+                return github_data[repository_name]
+
+            if self.commit_history is not None:
+                commits_info = self.get_incremental_commit_counters(repository_name)
+                return {
+                    "languages": self.get_languages_of_repository(repository_name),
+                    "quantity_of_pull_requests": self.get_quantity_of_pull_requests(
+                        repository_name
+                    ),
+                    "branches": self.get_branches(repository_name),
+                    "commit_counters": commits_info["counters"],
+                    "quantity_of_commits": commits_info["quantity"],
+                }
+
+            commits_info = self.count_commit_stream(
+                commit["message"] for commit in self.iter_commits(repository_name)
+            )
+            return {
+                "languages": self.get_languages_of_repository(repository_name),
+                "quantity_of_pull_requests": self.get_quantity_of_pull_requests(
+                    repository_name
+                ),
+                "branches": self.get_branches(repository_name),
+                "commit_counters": commits_info["counters"],
+                "quantity_of_commits": commits_info["quantity"],
+            }
+
+    def get_clone_url(self, repository_name):
+        """
+        Monta a URL usada para clonar o repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+
+        Returns:
+            str: URL do repositório no GitHub.
+        """
+        return f"{self.clone_base_url}/{self.organization_name}/{repository_name}"
+
+    def get_local_repository(self, repository_name):
+        """
+        Busca no cache de clones o clone local do repositório, usado como fonte de commits e branches.
+
+        Args:
+            repository_name (str): Nome do repositório.
+
+        Returns:
+            LocalGitRepository: Clone local do repositório.
+        """
+        return self.clone_cache.get_repository(self.get_clone_url(repository_name))
+
+    def make_sonar_evaluation(self, evaluation, with_measures=True):
+        """
+        Realiza a análise do repositório no SonarQube e adiciona as métricas na avaliação recebida.
+        Se houver cache de resultados e o HEAD do repositório e a configuração do scanner não mudaram desde
+        a última análise, as métricas salvas são usadas sem clonar e analisar o repositório, a não ser
+        que force_refresh seja True.
+
+        Args:
+            evaluation (obj): Objeto com as avaliações do repositório, contendo a chave "name".
+            with_measures (bool): Se False, somente executa a análise, e as métricas devem ser adicionadas
+            depois com add_sonar_measures.
+
+        Returns:
+            obj: O mesmo objeto de avaliação, com as métricas do SonarQube.
+        """
+        repository_name = evaluation["name"]
+        sonar = self.get_sonar_evaluations(repository_name, evaluation.get("languages"))
+        if self.sonar_result_cache is not None:
+            cache_key = self.sonar_result_cache.make_key(
+                repository_name,
+                get_remote_head(self.get_clone_url(repository_name), self.git_credential),
+                sonar.get_scanner_configuration(),
+            )
+            sonar_analysis = (
+                None if self.force_refresh else self.sonar_result_cache.get(cache_key)
+            )
+            if sonar_analysis is not None:
+                self.metrics.increment("sonar_result_cache_hits")
+                self.add_sonar_analysis(evaluation, sonar_analysis)
+                return evaluation
+            self.sonar_result_cache_keys[repository_name] = cache_key
+
+        sonar.run_analysis()
+        if with_measures:
+            with self.metrics.measure(repository_name, "measures"):
+                measures = self.sonar_measures.get_measures(sonar.project_key)
+            self.save_sonar_analysis(evaluation, sonar.get_evaluation(measures))
+        return evaluation
+
+    def save_sonar_analysis(self, evaluation, sonar_analysis):
+        """
+        Adiciona as métricas do SonarQube na avaliação e, se houver cache de resultados, salva as métricas
+        para o commit analisado.
+
+        Args:
+            evaluation (obj): Objeto com as avaliações do repositório.
+            sonar_analysis (obj): Métricas retornadas por SonarEvaluations.get_evaluation.
+
+        Returns:
+            None
+        """
+        self.add_sonar_analysis(evaluation, sonar_analysis)
+        cache_key = self.sonar_result_cache_keys.pop(evaluation["name"], None)
+        if cache_key is not None:
+            self.sonar_result_cache.set(cache_key, sonar_analysis)
+
+    def add_sonar_measures(self, evaluations):
+        """
+        Busca as métricas do SonarQube de vários repositórios já analisados em requisições agrupadas
+        e adiciona nas avaliações recebidas. Avaliações que já possuem as métricas, vindas do cache de
+        resultados, são mantidas.
+
+        Args:
+            evaluations (list): Lista de objetos com as avaliações dos repositórios.
+
+        Returns:
+            list: A mesma lista de avaliações, com as métricas do SonarQube.
+        """
+        pending = [
+            evaluation for evaluation in evaluations if "total_of_issues" not in evaluation
+        ]
+        if not pending:
+            return evaluations
+        start = time.perf_counter()
+        measures = self.sonar_measures.search_measures(
+            [evaluation["name"] for evaluation in pending]
+        )
+        elapsed = time.perf_counter() - start
+        for evaluation in pending:
+            self.metrics.add_phase(evaluation["name"], "measures", elapsed / len(pending))
+        for evaluation in pending:
+            sonar = self.get_sonar_evaluations(evaluation["name"])
+            self.save_sonar_analysis(
+                evaluation, sonar.get_evaluation(measures[evaluation["name"]])
+            )
+        return evaluations
 
-        sonar = SonarEvaluations(
+    def get_sonar_evaluations(self, repository_name, languages=None):
+        """
+        Cria o avaliador do SonarQube de um repositório, compartilhando cache de clones, workers de análise,
+        acompanhamento de tarefas, conexões com o SonarQube e escopo de análise.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            languages (list): Linguagens do repositório, usadas no escopo da análise.
+
+        Returns:
+            SonarEvaluations: Avaliador do SonarQube do repositório.
+        """
+        return SonarEvaluations(
             self.sonar_token,
             repository_name,
-            f"https://github.com/{self.organization_name}/{repository_name}",
+            self.get_clone_url(repository_name),
+            self.clone_cache,
+            self.scanner,
+            self.tracker,
+            self.sonar_measures,
+            self.metrics,
+            self.scan_scope,
+            languages,
+            self.sonar_projects,
         )
-        sonar_analysis = sonar.make_evaluation()
-        print(sonar_analysis)
+
+    def add_sonar_analysis(self, evaluation, sonar_analysis):
+        """
+        Adiciona as métricas calculadas pelo SonarEvaluations na avaliação do repositório.
+
+        Args:
+            evaluation (obj): Objeto com as avaliações do repositório.
+            sonar_analysis (obj): Métricas retornadas por SonarEvaluations.get_evaluation.
+
+        Returns:
+            None
+        """
         evaluation["total_of_issues"] = sonar_analysis["issues_total"]
         evaluation["issues_per_severity_quantity"] = sonar_analysis[
             "issues_per_severity_quantity"
@@ -79,94 +608,55 @@ class SonarAndGitEvaluation:
         evaluation["security_hotspots"] = sonar_analysis[
             "quantity_of_security_hotspots"
         ]
-        self.add_csv_record(self.file_name, evaluation)
 
-    def create_csv(self):
+    def create_outputs(self):
         """
-        Cria um arquivo csv com o nome recebido por paramêtro, e cria as colunas com os nomes corretos.
-
-        Args:
-            file_name (str): Nome do arquivo que deve ser criado.
-            fields (list): Lista com os nomes das colunas do arquivo.
+        Cria as saídas das avaliações, uma para cada formato em output_formats, que ficam abertas até close_outputs.
         """
-        self.file_name = f"{self.output_file_name}.csv"
-
-        fields = [
-            "repositório",
-            "linguagens",
-            "quantidade_de_pull_requests",
-            "git_flow",
-            "quantidade_de_commits",
-            "porcentagem_de_commits_no_padrão",
-            "porcentagem_de_commits_por_tipo",
+        self.outputs = [
+            create_sink(output_format, self.output_file_name, self.has_project, self.flush_every)
+            for output_format in self.output_formats
         ]
+        self.file_name = self.outputs[0].file_name
 
-        if self.has_project:
-            fields.append("cards_por_coluna")
-        fields += [
-            "total_de_issues",
-            "quantidade_de_issues_por_severidade",
-            "porcentagem_de_issues_por_severidade",
-            "quantidade_de_code_smells",
-            "quantidade_de_bugs",
-            "quantidade_de_vulnerabilidades",
-            "porcentagem_de_duplicação_de_código",
-            "quantidade_de_pontos_de_acesso_de_segurança",
-        ]
-
-        with open(self.file_name, "w", newline="", encoding="utf-8-sig") as csv_file:
-            csv_writer = csv.DictWriter(csv_file, fieldnames=fields)
-            csv_writer.writeheader()
-
-    def add_csv_record(self, file_name, record):
+    def add_record(self, record):
         """
-        Abre um arquivo baseado no nome passado e adiciona uma nova linha com as informações de avaliação de repositório.
+        Adiciona as informações de avaliação de um repositório em todas as saídas.
 
         Args:
-            file_name (str): Nome do arquivo que deve ser criado.
             record (obj): Objeto com os dados e avaliação de um repositório.
         """
-        with open(file_name, "a", newline="", encoding="utf-8-sig") as csv_file:
-            csv_writer = csv.DictWriter(csv_file, fieldnames=record.keys())
-            csv_writer.writerow(record)
+        for output in self.outputs:
+            output.write(record)
+
+    def close_outputs(self):
+        """
+        Finaliza as saídas, movendo cada arquivo para o nome final. Deve ser chamada ao fim da execução.
+        """
+        for output in self.outputs:
+            output.close()
 
-    def make_request(self, url):
+    def make_request(self, url, params=None):
         """
         Realiza uma solicitação HTTP do tipo GET e retorna o resultado como JSON.
-        Trata a paginação, caso tenha novas páginas, com mais registros, adiciona à lista de resultados.
+        Trata a paginação através do cabeçalho Link, buscando as demais páginas de forma concorrente
+        com uma sessão de conexões reaproveitadas.
 
         Args:
             url (str): A URL para a qual a solicitação GET será feita.
+            params (dict): Parâmetros de consulta adicionais.
 
         Returns:
             list: Uma lista contendo os resultados da solicitação HTTP.
         """
-        full_path = f"{self.base_url}/{url}?per_page=100&page="
-        result = []
-        page = 1
-        rel_next = True
-        while rel_next:
-            print(rel_next)
-            response = requests.get(
-                full_path,
-                headers={"Authorization": f"Bearer {self.git_token}"},
-            )
-            print(response.json())
-            result += response.json()
-
-            if response.headers.get(
-                "Link"
-            ) is not None and 'rel="next"' in response.headers.get("Link"):
-                page += 1
-            else:
-                rel_next = False
-
-        return result
+        return self.github_client.get_all(url, params)
 
     def get_repositories(self):
         """
         Realiza uma solicitação HTTP do tipo GET e retorna informações de repositórios
         da organização, que são tratados para retornar uma lista somente com os nomes.
+        Os dados usados pelo scheduler (tamanho, fork, arquivado, data do último push e linguagem) são
+        mantidos em repository_metadata.
 
         Args:
             url (str): A URL para a qual a solicitação GET será feita.
@@ -174,10 +664,40 @@ class SonarAndGitEvaluation:
         Returns:
             list: Uma lista com o nome dos repositórios da organização.
         """
-        org_repositories = self.make_request(f"orgs/{self.organization_name}/repos")
+        org_repositories = list(
+            self.github_client.iter_items(
+                f"orgs/{self.organization_name}/repos",
+                extract=self.get_repository_fields,
+            )
+        )
+        self.repository_metadata = {
+            repository["name"]: repository for repository in org_repositories
+        }
+        self.archived_repositories = {
+            repository["name"] for repository in org_repositories if repository["archived"]
+        }
         repository_names = self.get_repository_name(org_repositories)
         return repository_names
 
+    def get_repository_fields(self, repository):
+        """
+        Retira de um objeto de repositório da API somente os campos usados na avaliação e no scheduler.
+
+        Args:
+            repository (obj): Objeto de repositório retornado pela API.
+
+        Returns:
+            obj: Objeto com as chaves "name", "size", "fork", "archived", "pushed_at" e "language".
+        """
+        return {
+            "name": repository["name"],
+            "size": repository.get("size"),
+            "fork": repository.get("fork", False),
+            "archived": repository.get("archived", False),
+            "pushed_at": repository.get("pushed_at"),
+            "language": repository.get("language"),
+        }
+
     def get_repository_name(self, repositories):
         """
         Trata uma lista de objetos com informações sobre repositórios, para retornar apenas seus nomes.
@@ -191,7 +711,7 @@ class SonarAndGitEvaluation:
         repository_names = [repository["name"] for repository in repositories]
         return repository_names
 
-    def get_repository_info(self, repository_name, extra_path=None):
+    def get_repository_info(self, repository_name, extra_path=None, params=None):
         """
         Busca informações sobre certo repositório, pode receber um extra_path para retornar
         informações específicas sobre o mesmo.
@@ -199,12 +719,13 @@ class SonarAndGitEvaluation:
         Args:
             repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
             extra_path (str): Caminho de url adicional, para buscar informações específicas sobre repositório.
+            params (dict): Parâmetros de consulta adicionais.
 
         Returns:
             (list|obj): Retorna uma lista com informações sobre um repositório.
         """
         path = f"repos/{self.organization_name}/{repository_name}{extra_path if extra_path else ''}"
-        repository = self.make_request(path)
+        repository = self.make_request(path, params)
         return repository
 
     def get_languages_of_repository(self, repository_name):
@@ -217,41 +738,69 @@ class SonarAndGitEvaluation:
         Returns:
             list: Retorna uma lista com as linguagens utilizadas no projeto.
         """
-        not_languages = ["HTML", "CSS", "Roff"]
         languages = self.get_repository_info(repository_name, "/languages")
+        return self.filter_languages(languages)
+
+    def filter_languages(self, languages):
+        """
+        Remove da lista as linguagens que não são consideradas na avaliação.
+
+        Args:
+            languages (list): Lista com as linguagens do repositório.
+
+        Returns:
+            list: Lista com as linguagens consideradas na avaliação.
+        """
+        not_languages = ["HTML", "CSS", "Roff"]
         return [language for language in languages if language not in not_languages]
 
-    def get_commits(self, repository_name):
+    def iter_commits(self, repository_name, params=None):
         """
-        Busca informações sobre os commits de repositório.
+        Percorre os commits de um repositório, página a página, mantendo somente o SHA, a data e a mensagem
+        de cada commit.
 
         Args:
             repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
+            params (dict): Parâmetros de consulta adicionais, como "since".
 
         Returns:
-            list: Retorna uma lista de objetos que possuem informações sobre os commits.
+            Iterator[obj]: Objetos com as chaves "sha", "date" e "message", do commit mais recente para o mais antigo.
         """
-        commits = self.get_repository_info(repository_name, "/commits")
-        return commits
+        return self.github_client.iter_items(
+            f"repos/{self.organization_name}/{repository_name}/commits",
+            params,
+            extract=self.get_commit_fields,
+        )
 
-    def get_commits_information(self, commits: list):
+    def get_commit_fields(self, commit):
         """
-        Retira as mensagens da lista de objetos com informações de commits, coloca em uma lista, e conta a quantidade de commits.
+        Retira de um objeto de commit da API somente os campos usados na avaliação.
 
         Args:
-            commits (list): Lista de objetos com informações sobre commits
+            commit (obj): Objeto de commit retornado pela API.
 
         Returns:
-            obj: Objeto com a chave "commit_messages", que é uma lista com todas as mensagens de commit, e a chave "quantity", que traz a quantidade de commits do repositório
+            obj: Objeto com as chaves "sha", "date" e "message".
         """
-        quantity_of_commits = 0
-        commit_messages = []
+        return {
+            "sha": commit["sha"],
+            "date": commit["commit"]["committer"]["date"],
+            "message": commit["commit"]["message"],
+        }
+
+    def get_quantity_of_commits(self, repository_name):
+        """
+        Busca a quantidade de commits de um repositório com uma única requisição, sem baixar os commits.
 
-        for commit in commits:
-            quantity_of_commits += 1
-            commit_messages.append(commit["commit"]["message"])
+        Args:
+            repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
 
-        return {"commit_messages": commit_messages, "quantity": quantity_of_commits}
+        Returns:
+            int: Número de commits da branch padrão do repositório.
+        """
+        return self.github_client.count(
+            f"repos/{self.organization_name}/{repository_name}/commits"
+        )
 
     def check_commit_pattern(self, list_of_commits):
         """
@@ -266,48 +815,157 @@ class SonarAndGitEvaluation:
             obj: objeto contendo uma chave de porcentagem de commits no padrão, commits por tipo
             e porcentagem de commits por tipo, todos com valores numéricos, com no máximo 2 casas após a virgula.
         """
-        commits_per_type = {}
-        commit_pattern = re.compile(
-            r"^(docs|doc|fix|style|feat|refactor|perf|test|build|ci|chore|revert)(\(.*\))?:(\s){0,4}(\S){1}(.|\n)*$"
+        counters = self.count_commit_pattern(
+            list_of_commits[:-1], self.create_commit_counters()
         )
-        commits_with_pattern = 1
-        commits_without_pattern = 0
-        for commit_message in list_of_commits[:-1]:
-            if commit_pattern.match(commit_message):
-                commit_type = self.get_commit_type(commit_message)
-                commits_per_type[commit_type] = commits_per_type.get(commit_type, 0) + 1
-                commits_with_pattern += 1
-            else:
-                commits_without_pattern += 1
-
-        total = commits_without_pattern + commits_with_pattern
+        return self.summarize_commit_pattern(counters)
+
+    def create_commit_counters(self):
+        """
+        Cria os contadores da análise de padrão de commits. O commit mais antigo do repositório,
+        normalmente o commit inicial, não é analisado e é contado como um commit no padrão.
+
+        Returns:
+            obj: objeto com as chaves "commits_with_pattern", "commits_without_pattern" e "commits_per_type".
+        """
+        return {
+            "commits_with_pattern": 1,
+            "commits_without_pattern": 0,
+            "commits_per_type": {},
+        }
+
+    def count_commit_pattern(self, list_of_commits, counters):
+        """
+        Avalia se cada mensagem de commit atende ao padrão de commit e soma o resultado aos contadores recebidos.
+
+        Args:
+            list_of_commits (list): lista com mensagens de commit
+            counters (obj): contadores criados por create_commit_counters, que são atualizados.
+
+        Returns:
+            obj: os mesmos contadores recebidos, atualizados.
+        """
+        return self.commit_classifier.count(list_of_commits, counters)
+
+    def count_commit_stream(self, commit_messages):
+        """
+        Conta os commits e avalia o padrão das mensagens em uma única passada, à medida que as mensagens
+        são recebidas, com o mesmo resultado de check_commit_pattern.
+
+        Args:
+            commit_messages (Iterable[str]): mensagens de commit, da mais recente para a mais antiga.
+
+        Returns:
+            obj: Objeto com as chaves "counters", com os contadores da análise de padrão de commits, e
+            "quantity", com a quantidade de commits.
+        """
+        quantity = 0
+
+        def all_but_oldest():
+            nonlocal quantity
+            previous = None
+            for commit_message in commit_messages:
+                if quantity:
+                    yield previous
+                previous = commit_message
+                quantity += 1
+
+        counters = self.count_commit_pattern(all_but_oldest(), self.create_commit_counters())
+        return {"counters": counters, "quantity": quantity}
+
+    def summarize_commit_pattern(self, counters):
+        """
+        Converte os contadores da análise de padrão de commits em porcentagens.
+
+        Args:
+            counters (obj): contadores criados por create_commit_counters.
+
+        Returns:
+            obj: objeto contendo uma chave de porcentagem de commits no padrão, commits por tipo
+            e porcentagem de commits por tipo.
+        """
+        commits_with_pattern = counters["commits_with_pattern"]
+        total = counters["commits_without_pattern"] + commits_with_pattern
         percentage_of_commits_with_pattern = round(
             (commits_with_pattern / total) * 100, 2
         )
 
         commits_per_type_percentage = self.get_commits_per_type_percentage(
-            commits_per_type
+            counters["commits_per_type"]
         )
 
         return {
             "percentage_of_commits_with_pattern": percentage_of_commits_with_pattern,
-            "commits_per_type": commits_per_type,
+            "commits_per_type": counters["commits_per_type"],
             "commits_per_type_percentage": commits_per_type_percentage,
         }
 
-    def get_commit_type(self, commit_message):
+    def get_incremental_commit_counters(self, repository_name):
         """
-        Recebe a mensagem de commit e retira o tipo do commit baseado em expressão regular
+        Analisa somente os commits criados desde a última execução, somando o resultado aos contadores
+        salvos. Se o histórico salvo não for mais compatível com o do GitHub (histórico reescrito, ou
+        commits antigos incorporados depois), a análise é refeita com todos os commits.
 
         Args:
-            commit_message (str): texto com a mensagem de commit
+            repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
 
         Returns:
-            str: texto com o tipo do commit
+            obj: Objeto com as chaves "counters", com os contadores da análise de padrão de commits, e
+            "quantity", com a quantidade de commits.
+        """
+        history = self.commit_history.get(repository_name)
+        if history is not None:
+            commits = list(self.iter_commits(repository_name, {"since": history["last_date"]}))
+            shas = [commit["sha"] for commit in commits]
+            if history["last_sha"] in shas:
+                new_commits = commits[: shas.index(history["last_sha"])]
+                quantity = history["quantity"] + len(new_commits)
+                if quantity == self.get_quantity_of_commits(repository_name):
+                    counters = self.count_commit_pattern(
+                        [commit["message"] for commit in new_commits],
+                        history["counters"],
+                    )
+                    self.save_commit_history(repository_name, commits, quantity, counters)
+                    return {"counters": counters, "quantity": quantity}
+
+        newest_commits = []
+
+        def commit_messages():
+            for commit in self.iter_commits(repository_name):
+                if not newest_commits:
+                    newest_commits.append(commit)
+                yield commit["message"]
+
+        commits_info = self.count_commit_stream(commit_messages())
+        self.save_commit_history(
+            repository_name, newest_commits, commits_info["quantity"], commits_info["counters"]
+        )
+        return commits_info
+
+    def save_commit_history(self, repository_name, commits, quantity, counters):
         """
-        type_pattern = re.compile(f"^[a-zA-Z]+")
-        commit_type = type_pattern.search(commit_message)
-        return commit_type[0]
+        Salva o commit mais recente e os contadores da análise de padrão de commits do repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            commits (list): Lista de commits retornados por iter_commits, do mais recente para o mais antigo.
+            quantity (int): Quantidade total de commits do repositório.
+            counters (obj): Contadores da análise de padrão de commits.
+
+        Returns:
+            None
+        """
+        if not commits:
+            return
+        self.commit_history.set(
+            repository_name,
+            {
+                "last_sha": commits[0]["sha"],
+                "last_date": commits[0]["date"],
+                "quantity": quantity,
+                "counters": counters,
+            },
+        )
 
     def get_commits_per_type_percentage(self, commits_per_type):
         """
@@ -331,51 +989,57 @@ class SonarAndGitEvaluation:
 
     def get_branches(self, repository_name):
         """
-        Busca informações das branchs de um repositório e devolve uma lista com os nomes dessas branches.
+        Busca os nomes das branches de um repositório. Com branch_source "ls-remote", todos os nomes vêm de uma
+        única consulta do git ls-remote, sem consumir o limite da API. Com "api", as branches são buscadas
+        página a página no endpoint /branches.
 
         Args:
             repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
 
         Returns:
-            list: Lista com os nomes das branches existentes no projeto
+            Iterable[str]: Nomes das branches existentes no projeto.
         """
-        branches = self.get_repository_info(repository_name, "/branches")
-        branche_names = [branch['name'] for branch in branches]
-        return branche_names
+        if self.branch_source == "ls-remote":
+            return get_remote_branch_names(
+                self.get_clone_url(repository_name), self.git_credential
+            )
+        return self.github_client.iter_items(
+            f"repos/{self.organization_name}/{repository_name}/branches",
+            extract=lambda branch: branch["name"],
+        )
 
-    def check_git_flow(self, branch_names: List[str]):
+    def check_git_flow(self, branch_names: Iterable[str]):
         """
-        Recebe lista de branches de um repositório, e avalia se está utilizando o gitflow.
-        Baseado nas branches necessárias para se enquadrar como uso de gitflow.
+        Recebe as branches de um repositório, e avalia se está utilizando o gitflow.
+        Baseado nas branches necessárias para se enquadrar como uso de gitflow: feature, develop e main ou master.
+        Em cada nome é considerada somente a primeira palavra encontrada, e a verificação termina assim que
+        todas as branches necessárias são encontradas.
 
         Args:
-            branch_names (list): lista com nomes de branches.
+            branch_names (Iterable[str]): nomes de branches.
 
         Returns:
             bool: True ou False baseado no requisito de atender gitflow.
         """
-        pattern = re.compile(r"(feature|develop|master|main)")
         key_words = {"feature", "develop"}
         principal_branchs = {"main", "master"}
 
         itens_found = set()
-
         for name in branch_names:
-            name = name.lower()
-            if pattern.search(name):
-                p = pattern.search(name)
-                itens_found.add(p[0])
-
-        if itens_found.issuperset(key_words) and itens_found.intersection(
-            principal_branchs
-        ):
-            return True
-        else:
-            return False
+            match = GIT_FLOW_PATTERN.search(name.lower())
+            if match is None or match[0] in itens_found:
+                continue
+            itens_found.add(match[0])
+            if itens_found.issuperset(key_words) and itens_found.intersection(
+                principal_branchs
+            ):
+                return True
+        return False
 
     def get_quantity_of_pull_requests(self, repository_name):
         """
-        Busca a quantidade de pull requests de um repositório.
+        Busca a quantidade de pull requests abertos de um repositório com uma única requisição,
+        sem baixar os pull requests.
 
         Args:
             repository_name (str): Nome do repositório sobre o qual as informações serão resgatadas.
@@ -383,27 +1047,19 @@ class SonarAndGitEvaluation:
         Returns:
             int: Número de pull requests realizados no repositório.
         """
-        pull_requests = self.get_repository_info(repository_name, "/pulls")
-        return len(pull_requests)
+        return self.github_client.count(
+            f"repos/{self.organization_name}/{repository_name}/pulls"
+        )
 
     def get_cards_of_projects(self):
         """
-        Busca informações dos cards de todos os projetos de uma organização, através de uma requisição HTTP do tipo POST,
-        utilizando graphQL.
+        Busca os cards de todos os projetos de uma organização, com paginação por cursor, através de consultas
+        GraphQL, e monta o índice da quantidade de cards por coluna de cada projeto.
 
         Returns:
-            list: Lista com informações de cards de cada projeto de uma organização do Gitub.
+            dict: Dicionário com o título do projeto como chave e a quantidade de cards por coluna como valor.
         """
-        org = self.organization_name
-        query = "{organization(login:" + f"'{org}'" + "){ projectsV2(first: 100) { nodes { title items(first: 100) { nodes { content { ... on DraftIssue { id } } status: fieldValueByName(name: 'Status') { ... on ProjectV2ItemFieldSingleSelectValue { column: name updatedAt } } } } } } } }"
-
-        result = requests.post(
-            f"{self.base_url}/graphql",
-            headers={"Authorization": f"Bearer {self.git_token}"},
-            json={"query": query},
-        )
-
-        return result.json()["data"]["organization"]["projectsV2"]["nodes"]
+        return self.project_cards.load()
 
     def check_project_in_repositories(self, repository_name):
         """
@@ -416,37 +1072,13 @@ class SonarAndGitEvaluation:
         Returns:
             obj: objeto com o nome de cada coluna como chave, e um valor inteiro, representando a quantidade de cards na coluna.
         """
-        card_columns = {
-            "New": 0,
-            "Backlog": 0,
-            "Ready": 0,
-            "progress": 0,
-            "Blocked": 0,
-            "review": 0,
-            "Done": 0,
-        }
-        name_with_space = ""
-        for letter in repository_name:
-            if letter.isupper():
-                name_with_space += " " + letter
-            else:
-                name_with_space += letter
-        project_name = "Backlog -" + name_with_space
-        for project in self.projects:
-            if project_name == project["title"]:
-                for card in project["items"]["nodes"]:
-                    card_column = emoji.demojize(card["status"]["column"]).split(" ")[
-                        -1
-                    ]
-                    if card_column in card_columns:
-                        card_columns[card_column] += 1
-                    else:
-                        card_columns[card_column] = 1
-        return card_columns
+        return self.project_cards.get_cards(repository_name)
 
 ## Início da execução
 
-analyzer = SonarAndGitEvaluation(
-    "SergioRicJr", "analise_sonar_e_github", os.getenv("GIT_TOKEN"), os.getenv("SONAR_TOKEN")
-)
-analyzer.make_evaluation("todo-api")
+if __name__ == "__main__":
+    analyzer = SonarAndGitEvaluation(
+        "SergioRicJr", "analise_sonar_e_github", os.getenv("GIT_TOKEN"), os.getenv("SONAR_TOKEN")
+    )
+    analyzer.make_evaluation("todo-api")
+    analyzer.close_outputs()
@@ -0,0 +1,303 @@
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+
+CSV_FIELDS = {
+    "name": "repositório",
+    "languages": "linguagens",
+    "quantity_of_pull_requests": "quantidade_de_pull_requests",
+    "has_git_flow": "git_flow",
+    "quantity_of_commits": "quantidade_de_commits",
+    "commit_pattern_percent": "porcentagem_de_commits_no_padrão",
+    "commits_per_type_percent": "porcentagem_de_commits_por_tipo",
+    "cards": "cards_por_coluna",
+    "total_of_issues": "total_de_issues",
+    "issues_per_severity_quantity": "quantidade_de_issues_por_severidade",
+    "issues_per_severity_percentage": "porcentagem_de_issues_por_severidade",
+    "code_smells": "quantidade_de_code_smells",
+    "quantity_of_bugs": "quantidade_de_bugs",
+    "quantity_of_vulnerabilities": "quantidade_de_vulnerabilidades",
+    "percentage_of_code_duplication": "porcentagem_de_duplicação_de_código",
+    "security_hotspots": "quantidade_de_pontos_de_acesso_de_segurança",
+}
+
+
+def get_fields(has_project):
+    """
+    Lista as chaves da avaliação que são gravadas, na ordem das colunas.
+
+    Args:
+        has_project (bool): Se a avaliação possui a chave "cards".
+
+    Returns:
+        list: Lista com as chaves da avaliação.
+    """
+    return [field for field in CSV_FIELDS if has_project or field != "cards"]
+
+
+class OutputSink(ABC):
+    def __init__(self, file_name, has_project=False, flush_every=50) -> None:
+        """
+        Saída das avaliações, aberta uma única vez e mantida aberta durante toda a execução. Os registros
+        são gravados em um arquivo temporário, descarregados em disco a cada flush_every registros, e o
+        arquivo só é movido para o nome final em close, de forma atômica.
+
+        Args:
+            file_name (str): Nome do arquivo final.
+            has_project (bool): Se as avaliações possuem a chave "cards".
+            flush_every (int): Quantidade de registros entre cada descarga em disco.
+        """
+        self.file_name = file_name
+        self.temporary_file_name = f"{file_name}.tmp"
+        self.fields = get_fields(has_project)
+        self.flush_every = flush_every
+        self.pending = 0
+        self.open()
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write_record(self, record):
+        pass
+
+    @abstractmethod
+    def flush(self):
+        pass
+
+    @abstractmethod
+    def finalize(self):
+        pass
+
+    @abstractmethod
+    def read(self, file_name):
+        """
+        Lê as avaliações de um arquivo final do mesmo formato, como o de outra execução.
+
+        Args:
+            file_name (str): Nome do arquivo.
+
+        Returns:
+            Iterator[obj]: Avaliações do arquivo, com as chaves da avaliação.
+        """
+
+    def write(self, record):
+        """
+        Grava uma avaliação, descarregando em disco a cada flush_every avaliações.
+
+        Args:
+            record (obj): Objeto com os dados e avaliação de um repositório.
+
+        Returns:
+            None
+        """
+        self.write_record(record)
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+            self.pending = 0
+
+    def close(self):
+        """
+        Descarrega os registros pendentes, fecha o arquivo temporário e o move para o nome final.
+
+        Returns:
+            None
+        """
+        self.flush()
+        self.finalize()
+        os.replace(self.temporary_file_name, self.file_name)
+
+
+class CsvSink(OutputSink):
+    def open(self):
+        self.file = open(self.temporary_file_name, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.DictWriter(
+            self.file, fieldnames=[CSV_FIELDS[field] for field in self.fields]
+        )
+        self.writer.writeheader()
+
+    def write_record(self, record):
+        self.writer.writerow(
+            {CSV_FIELDS[field]: record.get(field, "") for field in self.fields}
+        )
+
+    def read(self, file_name):
+        with open(file_name, newline="", encoding="utf-8-sig") as file:
+            for row in csv.DictReader(file):
+                yield {field: row.get(CSV_FIELDS[field], "") for field in self.fields}
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def finalize(self):
+        self.file.close()
+
+
+class JsonLinesSink(OutputSink):
+    def open(self):
+        self.file = open(self.temporary_file_name, "w", encoding="utf-8")
+
+    def write_record(self, record):
+        self.file.write(
+            json.dumps({field: record.get(field) for field in self.fields}, ensure_ascii=False)
+        )
+        self.file.write("\n")
+
+    def read(self, file_name):
+        with open(file_name, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def finalize(self):
+        self.file.close()
+
+
+class SqliteSink(OutputSink):
+    NESTED_FIELDS = {
+        "languages",
+        "commits_per_type_percent",
+        "cards",
+        "issues_per_severity_quantity",
+        "issues_per_severity_percentage",
+    }
+
+    def open(self):
+        if os.path.exists(self.temporary_file_name):
+            os.remove(self.temporary_file_name)
+        self.connection = sqlite3.connect(self.temporary_file_name, check_same_thread=False)
+        columns = ", ".join(
+            f"{field} TEXT PRIMARY KEY" if field == "name" else field for field in self.fields
+        )
+        self.connection.execute(f"CREATE TABLE evaluations ({columns})")
+
+    def write_record(self, record):
+        values = [
+            json.dumps(record.get(field), ensure_ascii=False)
+            if field in self.NESTED_FIELDS
+            else record.get(field)
+            for field in self.fields
+        ]
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO evaluations ({', '.join(self.fields)}) "
+            f"VALUES ({', '.join('?' for _ in self.fields)})",
+            values,
+        )
+
+    def read(self, file_name):
+        connection = sqlite3.connect(file_name)
+        try:
+            cursor = connection.execute(f"SELECT {', '.join(self.fields)} FROM evaluations")
+            for values in cursor:
+                yield {
+                    field: json.loads(value)
+                    if field in self.NESTED_FIELDS and value is not None
+                    else value
+                    for field, value in zip(self.fields, values)
+                }
+        finally:
+            connection.close()
+
+    def flush(self):
+        self.connection.commit()
+
+    def finalize(self):
+        self.connection.close()
+
+
+class ParquetSink(OutputSink):
+    def open(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "A saída em Parquet precisa do pacote pyarrow: pip install pyarrow"
+            ) from error
+
+        self.pyarrow = pyarrow
+        types = {
+            "name": pyarrow.string(),
+            "languages": pyarrow.list_(pyarrow.string()),
+            "quantity_of_pull_requests": pyarrow.int64(),
+            "has_git_flow": pyarrow.bool_(),
+            "quantity_of_commits": pyarrow.int64(),
+            "commit_pattern_percent": pyarrow.float64(),
+            "commits_per_type_percent": pyarrow.map_(pyarrow.string(), pyarrow.float64()),
+            "cards": pyarrow.map_(pyarrow.string(), pyarrow.int64()),
+            "total_of_issues": pyarrow.int64(),
+            "issues_per_severity_quantity": pyarrow.map_(pyarrow.string(), pyarrow.int64()),
+            "issues_per_severity_percentage": pyarrow.map_(pyarrow.string(), pyarrow.float64()),
+            "code_smells": pyarrow.int64(),
+            "quantity_of_bugs": pyarrow.int64(),
+            "quantity_of_vulnerabilities": pyarrow.int64(),
+            "percentage_of_code_duplication": pyarrow.float64(),
+            "security_hotspots": pyarrow.int64(),
+        }
+        self.schema = pyarrow.schema([(field, types[field]) for field in self.fields])
+        self.map_fields = {
+            field for field in self.fields if isinstance(types[field], pyarrow.MapType)
+        }
+        self.writer = pyarrow.parquet.ParquetWriter(self.temporary_file_name, self.schema)
+        self.rows = []
+
+    def write_record(self, record):
+        row = {}
+        for field in self.fields:
+            value = record.get(field)
+            row[field] = list(value.items()) if isinstance(value, dict) else value
+        self.rows.append(row)
+
+    def read(self, file_name):
+        parquet_file = self.pyarrow.parquet.ParquetFile(file_name)
+        for batch in parquet_file.iter_batches(columns=self.fields):
+            for row in batch.to_pylist():
+                yield {
+                    field: dict(value) if field in self.map_fields and value is not None else value
+                    for field, value in row.items()
+                }
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(
+                self.pyarrow.Table.from_pylist(self.rows, schema=self.schema)
+            )
+            self.rows = []
+
+    def finalize(self):
+        self.writer.close()
+
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "sqlite": SqliteSink,
+    "parquet": ParquetSink,
+}
+
+
+def create_sink(output_format, output_file_name, has_project=False, flush_every=50):
+    """
+    Cria a saída de um formato, com a extensão do formato no nome do arquivo.
+
+    Args:
+        output_format (str): Formato da saída: "csv", "jsonl", "sqlite" ou "parquet".
+        output_file_name (str): Nome do arquivo, sem extensão.
+        has_project (bool): Se as avaliações possuem a chave "cards".
+        flush_every (int): Quantidade de registros entre cada descarga em disco.
+
+    Returns:
+        OutputSink: Saída criada.
+    """
+    return SINKS[output_format](
+        f"{output_file_name}.{output_format}", has_project, flush_every
+    )
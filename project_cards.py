@@ -0,0 +1,184 @@
+import json
+from collections import Counter
+from functools import lru_cache
+
+import emoji
+
+PAGE_SIZE = 100
+
+DEFAULT_COLUMNS = ("New", "Backlog", "Ready", "progress", "Blocked", "review", "Done")
+
+ITEMS_FIELDS = """
+    items(first: %(page_size)d%(after)s) {
+        nodes {
+            status: fieldValueByName(name: "Status") {
+                ... on ProjectV2ItemFieldSingleSelectValue { column: name }
+            }
+        }
+        pageInfo { hasNextPage endCursor }
+    }
+"""
+
+PROJECTS_QUERY = """
+{
+    organization(login: %(organization)s) {
+        projectsV2(first: %(page_size)d%(after)s) {
+            nodes { id title %(items)s }
+            pageInfo { hasNextPage endCursor }
+        }
+    }
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def normalize_column(column):
+    """
+    Converte o nome de uma coluna do projeto no nome usado na contagem, removendo emojis e mantendo
+    somente a última palavra, como em "🏗 In progress" -> "progress".
+
+    Args:
+        column (str): Nome da coluna no GitHub.
+
+    Returns:
+        str: Nome normalizado da coluna.
+    """
+    return emoji.demojize(column).split(" ")[-1]
+
+
+def get_project_title(repository_name):
+    """
+    Monta o título do projeto de um repositório, separando as palavras em camel case, como em
+    "TodoApi" -> "Backlog - Todo Api".
+
+    Args:
+        repository_name (str): Nome do repositório.
+
+    Returns:
+        str: Título do projeto.
+    """
+    name_with_space = "".join(
+        " " + letter if letter.isupper() else letter for letter in repository_name
+    )
+    return "Backlog -" + name_with_space
+
+
+def get_after(connection):
+    page_info = connection["pageInfo"]
+    if not page_info["hasNextPage"]:
+        return None
+    return f", after: {json.dumps(page_info['endCursor'])}"
+
+
+class ProjectCardIndex:
+    def __init__(self, github_client, organization_name) -> None:
+        """
+        Índice da quantidade de cards por coluna de cada projeto (GitHub Projects) de uma organização. Todos os
+        projetos e cards são buscados uma única vez, com paginação por cursor, e as consultas de cada
+        repositório são feitas pelo título do projeto, sem percorrer os projetos novamente.
+
+        Args:
+            github_client (GitHubClient): Cliente usado para as consultas GraphQL.
+            organization_name (str): Nome da organização dona dos projetos.
+        """
+        self.github_client = github_client
+        self.organization_name = organization_name
+        self.columns_per_title = {}
+
+    def load(self):
+        """
+        Busca todos os projetos da organização e todos os cards de cada projeto, e monta o índice.
+
+        Returns:
+            dict: Dicionário com o título do projeto como chave e a quantidade de cards por coluna como valor.
+        """
+        self.columns_per_title = {}
+        after = ""
+        while after is not None:
+            projects = self.query(
+                PROJECTS_QUERY
+                % {
+                    "organization": json.dumps(self.organization_name),
+                    "page_size": PAGE_SIZE,
+                    "after": after,
+                    "items": ITEMS_FIELDS % {"page_size": PAGE_SIZE, "after": ""},
+                }
+            )["organization"]["projectsV2"]
+
+            pending = {}
+            for project in projects["nodes"]:
+                self.add_items(project["title"], project["items"])
+                items_after = get_after(project["items"])
+                if items_after is not None:
+                    pending[project["id"]] = (project["title"], items_after)
+            self.load_remaining_items(pending)
+            after = get_after(projects)
+        return self.columns_per_title
+
+    def load_remaining_items(self, pending):
+        """
+        Busca as próximas páginas de cards dos projetos com mais cards do que cabem na primeira página,
+        com uma consulta agrupada (um alias por projeto) para cada página.
+
+        Args:
+            pending (dict): Dicionário com o id do projeto como chave e uma tupla com o título e o cursor
+            da próxima página como valor.
+
+        Returns:
+            None
+        """
+        while pending:
+            aliases = {f"p{index}": project_id for index, project_id in enumerate(pending)}
+            fields = []
+            for alias, project_id in aliases.items():
+                items = ITEMS_FIELDS % {"page_size": PAGE_SIZE, "after": pending[project_id][1]}
+                fields.append(
+                    f"{alias}: node(id: {json.dumps(project_id)}) {{ ... on ProjectV2 {{{items}}} }}"
+                )
+            data = self.query("{" + "".join(fields) + "}")
+            next_pending = {}
+            for alias, project_id in aliases.items():
+                title = pending[project_id][0]
+                items = data[alias]["items"]
+                self.add_items(title, items)
+                items_after = get_after(items)
+                if items_after is not None:
+                    next_pending[project_id] = (title, items_after)
+            pending = next_pending
+
+    def add_items(self, title, items):
+        """
+        Soma os cards de uma página de um projeto no índice. Cards sem coluna são ignorados.
+
+        Args:
+            title (str): Título do projeto.
+            items (dict): Página de cards retornada pela API.
+
+        Returns:
+            None
+        """
+        columns = self.columns_per_title.setdefault(title, Counter())
+        for card in items["nodes"]:
+            status = card.get("status") or {}
+            if status.get("column"):
+                columns[normalize_column(status["column"])] += 1
+
+    def query(self, query):
+        response = self.github_client.post_graphql(query)
+        if response.get("errors"):
+            raise RuntimeError(f"Erro na consulta GraphQL: {response['errors']}")
+        return response["data"]
+
+    def get_cards(self, repository_name):
+        """
+        Busca a quantidade de cards por coluna do projeto de um repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+
+        Returns:
+            dict: Dicionário com o nome de cada coluna como chave e a quantidade de cards como valor.
+        """
+        card_columns = dict.fromkeys(DEFAULT_COLUMNS, 0)
+        card_columns.update(self.columns_per_title.get(get_project_title(repository_name), {}))
+        return card_columns
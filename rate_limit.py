@@ -0,0 +1,118 @@
+import threading
+import time
+
+SECONDARY_LIMIT_WAIT = 60
+
+
+class RateLimitScheduler:
+    def __init__(self, tokens, reserve=50, max_retries=5) -> None:
+        """
+        Distribui as requisições entre um conjunto de tokens do GitHub, acompanhando o limite restante
+        de cada token por recurso (core, graphql), através dos cabeçalhos X-RateLimit-*. Um token deixa de
+        ser usado quando restam reserve requisições, e, se nenhum token estiver disponível, a espera dura
+        somente até o reset mais próximo.
+
+        Args:
+            tokens (list): Lista de tokens do GitHub.
+            reserve (int): Quantidade de requisições mantida em reserva em cada token.
+            max_retries (int): Quantidade máxima de novas tentativas de uma requisição limitada pela API.
+        """
+        if not tokens:
+            raise ValueError("Ao menos um token do GitHub deve ser informado")
+        self.tokens = list(tokens)
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.budgets = {}
+        self.condition = threading.Condition()
+
+    def get_budget(self, token, resource):
+        budget = self.budgets.get((token, resource))
+        if budget is None:
+            budget = {"remaining": None, "reset": 0.0, "blocked_until": 0.0}
+            self.budgets[(token, resource)] = budget
+        return budget
+
+    def acquire(self, resource="core"):
+        """
+        Escolhe o token com maior limite restante para o recurso, bloqueando até que algum token
+        esteja disponível. O limite restante é decrementado antes da requisição, para que requisições
+        concorrentes não ultrapassem o limite.
+
+        Args:
+            resource (str): Recurso da API que será consumido (core ou graphql).
+
+        Returns:
+            str: Token que deve ser usado na requisição.
+        """
+        with self.condition:
+            while True:
+                now = time.time()
+                candidates = []
+                waits = []
+                for token in self.tokens:
+                    budget = self.get_budget(token, resource)
+                    if budget["remaining"] is not None and now >= budget["reset"]:
+                        budget["remaining"] = None
+                    available_at = budget["blocked_until"]
+                    if budget["remaining"] is not None and budget["remaining"] <= self.reserve:
+                        available_at = max(available_at, budget["reset"])
+                    if available_at > now:
+                        waits.append(available_at - now)
+                    else:
+                        candidates.append(token)
+
+                if candidates:
+                    token = max(candidates, key=lambda token: self.get_remaining(token, resource))
+                    budget = self.get_budget(token, resource)
+                    if budget["remaining"] is not None:
+                        budget["remaining"] -= 1
+                    return token
+
+                self.condition.wait(min(waits) + 1)
+
+    def get_remaining(self, token, resource):
+        remaining = self.get_budget(token, resource)["remaining"]
+        return float("inf") if remaining is None else remaining
+
+    def update(self, token, resource, response, attempt):
+        """
+        Atualiza o limite do token com os cabeçalhos da resposta e informa se a requisição deve ser
+        repetida, quando foi recusada por limite primário ou secundário da API.
+
+        Args:
+            token (str): Token usado na requisição.
+            resource (str): Recurso da API consumido pela requisição.
+            response (requests.Response): Resposta da requisição.
+            attempt (int): Número da tentativa atual, começando em 0.
+
+        Returns:
+            bool: True se a requisição deve ser feita novamente.
+        """
+        headers = response.headers
+        with self.condition:
+            budget = self.get_budget(token, headers.get("X-RateLimit-Resource", resource))
+            if headers.get("X-RateLimit-Remaining") is not None:
+                budget["remaining"] = int(headers["X-RateLimit-Remaining"])
+            if headers.get("X-RateLimit-Reset") is not None:
+                budget["reset"] = float(headers["X-RateLimit-Reset"])
+
+            limited = response.status_code == 429 or (
+                response.status_code == 403
+                and (
+                    headers.get("Retry-After") is not None
+                    or budget["remaining"] == 0
+                    or "rate limit" in response.text.lower()
+                )
+            )
+            if not limited:
+                self.condition.notify_all()
+                return False
+
+            now = time.time()
+            if headers.get("Retry-After") is not None:
+                budget["blocked_until"] = now + float(headers["Retry-After"])
+            elif budget["remaining"] == 0:
+                budget["blocked_until"] = budget["reset"]
+            else:
+                budget["blocked_until"] = now + SECONDARY_LIMIT_WAIT * 2**attempt
+            return attempt < self.max_retries
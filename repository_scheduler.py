@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+
+
+class RepositoryScheduler:
+    def __init__(
+        self,
+        skip_empty=True,
+        skip_archived=False,
+        skip_forks=False,
+        state_file=None,
+    ) -> None:
+        """
+        Define quais repositórios da organização são avaliados e em que ordem, a partir dos dados da listagem
+        de repositórios (size, archived, fork e pushed_at). Os maiores repositórios são avaliados primeiro,
+        para que um repositório grande não fique sozinho no fim da execução. Com state_file, repositórios sem
+        push desde a última avaliação não são avaliados novamente, e a avaliação anterior é reaproveitada.
+
+        Args:
+            skip_empty (bool): Se repositórios vazios (size 0) são ignorados.
+            skip_archived (bool): Se repositórios arquivados são ignorados.
+            skip_forks (bool): Se forks são ignorados.
+            state_file (str): Nome do arquivo json com o pushed_at e a avaliação de cada repositório, ou None.
+        """
+        self.skip_empty = skip_empty
+        self.skip_archived = skip_archived
+        self.skip_forks = skip_forks
+        self.lock = threading.Lock()
+        self.pushed_at = {}
+        self.skipped = {}
+        self.set_state_file(state_file)
+
+    def set_state_file(self, state_file):
+        """
+        Troca o arquivo de estado, carregando o estado salvo nele. Usado para que cada partição de uma
+        execução tenha o seu próprio arquivo.
+
+        Args:
+            state_file (str): Nome do arquivo json, ou None.
+
+        Returns:
+            None
+        """
+        self.state_file = state_file
+        self.state = {}
+        if state_file and os.path.exists(state_file):
+            with open(state_file, encoding="utf-8") as file:
+                self.state = json.load(file)
+
+    def get_skip_reason(self, repository):
+        """
+        Verifica se um repositório deve ser ignorado pelas regras configuradas.
+
+        Args:
+            repository (dict): Dados do repositório retornados pela listagem da organização.
+
+        Returns:
+            str: Motivo ("empty", "archived", "fork" ou "unchanged"), ou None se o repositório deve ser avaliado.
+        """
+        if self.skip_empty and repository.get("size") == 0:
+            return "empty"
+        if self.skip_archived and repository.get("archived"):
+            return "archived"
+        if self.skip_forks and repository.get("fork"):
+            return "fork"
+        previous = self.state.get(repository["name"])
+        if (
+            self.state_file
+            and previous is not None
+            and repository.get("pushed_at")
+            and previous["pushed_at"] == repository["pushed_at"]
+        ):
+            return "unchanged"
+        return None
+
+    def schedule(self, repositories):
+        """
+        Filtra e ordena os repositórios: do maior para o menor e, entre repositórios do mesmo tamanho, do
+        push mais recente para o mais antigo.
+
+        Args:
+            repositories (list): Lista com os dados dos repositórios retornados pela listagem da organização.
+
+        Returns:
+            list: Lista com os nomes dos repositórios que serão avaliados, na ordem de avaliação.
+        """
+        self.skipped = {}
+        scheduled = []
+        for repository in repositories:
+            self.pushed_at[repository["name"]] = repository.get("pushed_at")
+            reason = self.get_skip_reason(repository)
+            if reason is None:
+                scheduled.append(repository)
+            else:
+                self.skipped[repository["name"]] = reason
+        scheduled.sort(
+            key=lambda repository: (repository.get("size") or 0, repository.get("pushed_at") or ""),
+            reverse=True,
+        )
+        return [repository["name"] for repository in scheduled]
+
+    def get_unchanged_evaluations(self):
+        """
+        Busca as avaliações anteriores dos repositórios ignorados por não terem mudado.
+
+        Returns:
+            list: Lista com as avaliações salvas.
+        """
+        return [
+            self.state[name]["evaluation"]
+            for name, reason in self.skipped.items()
+            if reason == "unchanged"
+        ]
+
+    def record(self, evaluation):
+        """
+        Salva o pushed_at e a avaliação de um repositório avaliado, de forma atômica.
+
+        Args:
+            evaluation (dict): Avaliação do repositório.
+
+        Returns:
+            None
+        """
+        pushed_at = self.pushed_at.get(evaluation["name"])
+        if not self.state_file or pushed_at is None:
+            return
+        with self.lock:
+            self.state[evaluation["name"]] = {"pushed_at": pushed_at, "evaluation": evaluation}
+            temporary_file_name = f"{self.state_file}.tmp"
+            with open(temporary_file_name, "w", encoding="utf-8") as file:
+                json.dump(self.state, file, ensure_ascii=False)
+            os.replace(temporary_file_name, self.state_file)
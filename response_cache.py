@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ResponseCache:
+    def __init__(self, directory=".github_cache", max_bytes=512 * 1024 * 1024) -> None:
+        """
+        Cache em disco de respostas da API do GitHub, usado para requisições condicionais.
+        Cada entrada guarda o corpo da resposta e os cabeçalhos ETag, Last-Modified e Link, e é
+        salva em um arquivo próprio. Quando o tamanho total passa de max_bytes, as entradas usadas
+        há mais tempo são removidas.
+
+        Args:
+            directory (str): Pasta onde as entradas do cache são salvas.
+            max_bytes (int): Tamanho máximo, em bytes, ocupado pelas entradas do cache.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.entries = {}
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".json"):
+                stat = os.stat(os.path.join(directory, file_name))
+                self.entries[file_name[:-5]] = [stat.st_size, stat.st_mtime]
+        self.total_bytes = sum(size for size, _ in self.entries.values())
+
+    def make_key(self, url, body=None):
+        """
+        Gera a chave de uma entrada a partir da URL completa e, em requisições POST, do corpo enviado.
+
+        Args:
+            url (str): URL completa da requisição, com os parâmetros de consulta.
+            body (dict): Corpo da requisição, ou None.
+
+        Returns:
+            str: Chave da entrada no cache.
+        """
+        content = url if body is None else url + json.dumps(body, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Busca uma entrada do cache e marca como usada recentemente.
+
+        Args:
+            key (str): Chave da entrada.
+
+        Returns:
+            dict: Entrada com as chaves "etag", "last_modified", "link" e "body", ou None se não existir.
+        """
+        path = self.get_path(key)
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries[key][1] = time.time()
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.remove(key)
+            return None
+        return entry
+
+    def set(self, key, entry):
+        """
+        Salva uma entrada no cache, substituindo a anterior de forma atômica, e remove as
+        entradas mais antigas caso o tamanho máximo seja ultrapassado.
+
+        Args:
+            key (str): Chave da entrada.
+            entry (dict): Entrada com as chaves "etag", "last_modified", "link" e "body".
+
+        Returns:
+            None
+        """
+        path = self.get_path(key)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        os.replace(temporary_path, path)
+        size = os.path.getsize(path)
+
+        with self.lock:
+            previous = self.entries.get(key)
+            self.total_bytes += size - (previous[0] if previous else 0)
+            self.entries[key] = [size, time.time()]
+            evicted = []
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                oldest = min(
+                    (k for k in self.entries if k != key),
+                    key=lambda k: self.entries[k][1],
+                )
+                self.total_bytes -= self.entries.pop(oldest)[0]
+                evicted.append(oldest)
+
+        for oldest in evicted:
+            try:
+                os.remove(self.get_path(oldest))
+            except OSError:
+                pass
+
+    def remove(self, key):
+        """
+        Remove uma entrada do cache.
+
+        Args:
+            key (str): Chave da entrada.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry:
+                self.total_bytes -= entry[0]
+        try:
+            os.remove(self.get_path(key))
+        except OSError:
+            pass
+
+    def get_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PROMETHEUS_PREFIX = "sonar_and_github_bot"
+
+
+def create_empty_requests():
+    return {"requests": 0, "bytes": 0, "cache_hits": 0, "errors": 0}
+
+
+def create_empty_rate_limit():
+    return {"consumed": 0, "lowest_remaining": None, "throttled": 0}
+
+
+class RunMetrics:
+    def __init__(self) -> None:
+        """
+        Métricas de uma execução: tempo de cada etapa (fetch, clone, scan, ce_wait, measures, write) por
+        repositório, quantidade de requisições, bytes recebidos e acertos de cache por serviço, e consumo
+        do limite da API do GitHub por recurso. Pode ser usada por várias threads ao mesmo tempo.
+        """
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.phases = {}
+        self.requests = {}
+        self.rate_limit = {}
+        self.counters = {}
+
+    @contextmanager
+    def measure(self, repository_name, phase):
+        """
+        Mede o tempo de uma etapa da avaliação de um repositório, somando ao tempo já registrado.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            phase (str): Nome da etapa.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(repository_name, phase, time.perf_counter() - start)
+
+    def add_phase(self, repository_name, phase, seconds):
+        """
+        Soma um tempo a uma etapa da avaliação de um repositório.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            phase (str): Nome da etapa.
+            seconds (float): Tempo, em segundos.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            phases = self.phases.setdefault(repository_name, {})
+            phases[phase] = phases.get(phase, 0) + seconds
+
+    def increment(self, name, value=1):
+        """
+        Soma um valor a um contador da execução.
+
+        Args:
+            name (str): Nome do contador.
+            value (int): Valor somado.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def track_session(self, session, service):
+        """
+        Registra todas as respostas recebidas por uma sessão do requests, através de um hook de resposta.
+
+        Args:
+            session (requests.Session): Sessão cujas respostas são registradas.
+            service (str): Nome do serviço, como "github" ou "sonar".
+
+        Returns:
+            None
+        """
+        session.hooks["response"].append(
+            lambda response, *args, **kwargs: self.add_response(service, response)
+        )
+
+    def add_response(self, service, response):
+        """
+        Registra uma resposta: tamanho do corpo, acerto de cache (304) e, nas respostas do GitHub, o
+        consumo do limite da API informado pelos cabeçalhos X-RateLimit-*.
+
+        Args:
+            service (str): Nome do serviço.
+            response (requests.Response): Resposta recebida.
+
+        Returns:
+            None
+        """
+        size = len(response.content or b"")
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource")
+        remaining = headers.get("X-RateLimit-Remaining")
+        with self.lock:
+            requests = self.requests.setdefault(service, create_empty_requests())
+            requests["requests"] += 1
+            requests["bytes"] += size
+            if response.status_code == 304:
+                requests["cache_hits"] += 1
+            elif response.status_code >= 400:
+                requests["errors"] += 1
+
+            if resource is None:
+                return
+            rate_limit = self.rate_limit.setdefault(resource, create_empty_rate_limit())
+            if response.status_code != 304:
+                rate_limit["consumed"] += 1
+            if remaining is not None:
+                lowest = rate_limit["lowest_remaining"]
+                rate_limit["lowest_remaining"] = (
+                    int(remaining) if lowest is None else min(lowest, int(remaining))
+                )
+            if response.status_code == 429 or (
+                response.status_code == 403 and (remaining == "0" or "Retry-After" in headers)
+            ):
+                rate_limit["throttled"] += 1
+
+    def get_phase_totals(self):
+        totals = {}
+        for phases in self.phases.values():
+            for phase, seconds in phases.items():
+                total = totals.setdefault(phase, {"seconds": 0, "count": 0, "max_seconds": 0})
+                total["seconds"] += seconds
+                total["count"] += 1
+                total["max_seconds"] = max(total["max_seconds"], seconds)
+        return totals
+
+    def get_report(self):
+        """
+        Monta o relatório da execução.
+
+        Returns:
+            dict: Relatório com as chaves "duration_seconds", "counters", "phases", "requests",
+            "rate_limit" e "repositories".
+        """
+        with self.lock:
+            return {
+                "duration_seconds": time.time() - self.started_at,
+                "counters": dict(self.counters),
+                "phases": self.get_phase_totals(),
+                "requests": {service: dict(values) for service, values in self.requests.items()},
+                "rate_limit": {resource: dict(values) for resource, values in self.rate_limit.items()},
+                "repositories": {name: dict(phases) for name, phases in self.phases.items()},
+            }
+
+    def get_prometheus_lines(self, report, labels=None):
+        def sample(metric, value, **metric_labels):
+            metric_labels = {**(labels or {}), **metric_labels}
+            if not metric_labels:
+                return f"{PROMETHEUS_PREFIX}_{metric} {value}"
+            label_text = ",".join(f'{name}="{label}"' for name, label in metric_labels.items())
+            return f"{PROMETHEUS_PREFIX}_{metric}{{{label_text}}} {value}"
+
+        lines = [
+            f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge",
+            sample("run_duration_seconds", report["duration_seconds"]),
+        ]
+        for name, value in report["counters"].items():
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter")
+            lines.append(sample(f"{name}_total", value))
+
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_phase_seconds summary")
+        for phase, total in report["phases"].items():
+            lines.append(sample("phase_seconds_sum", total["seconds"], phase=phase))
+            lines.append(sample("phase_seconds_count", total["count"], phase=phase))
+
+        for key in create_empty_requests():
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_http_{key}_total counter")
+            for service, values in report["requests"].items():
+                lines.append(sample(f"http_{key}_total", values[key], service=service))
+
+        for key, metric, metric_type in (
+            ("consumed", "rate_limit_consumed_total", "counter"),
+            ("throttled", "rate_limit_throttled_total", "counter"),
+            ("lowest_remaining", "rate_limit_lowest_remaining", "gauge"),
+        ):
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{metric} {metric_type}")
+            for resource, values in report["rate_limit"].items():
+                if values[key] is not None:
+                    lines.append(sample(metric, values[key], resource=resource))
+        return lines
+
+    def write_report(self, report_file=None, prometheus_file=None, labels=None):
+        """
+        Salva o relatório da execução em JSON e/ou no formato de texto do Prometheus (para o textfile
+        collector do node_exporter). Os arquivos são escritos de forma atômica.
+
+        Args:
+            report_file (str): Nome do arquivo JSON, ou None.
+            prometheus_file (str): Nome do arquivo .prom, ou None.
+            labels (dict): Rótulos adicionados a todas as métricas do Prometheus, como a partição da execução.
+
+        Returns:
+            dict: Relatório da execução.
+        """
+        report = self.get_report()
+        if report_file:
+            self.write_file(report_file, json.dumps(report, indent=2, ensure_ascii=False))
+        if prometheus_file:
+            self.write_file(
+                prometheus_file, "\n".join(self.get_prometheus_lines(report, labels)) + "\n"
+            )
+        return report
+
+    def write_file(self, file_name, content):
+        temporary_file_name = f"{file_name}.tmp"
+        with open(temporary_file_name, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temporary_file_name, file_name)
@@ -0,0 +1,96 @@
+LANGUAGE_PATTERNS = {
+    "C": ["**/*.c", "**/*.h"],
+    "C#": ["**/*.cs", "**/*.razor"],
+    "C++": ["**/*.cpp", "**/*.cc", "**/*.cxx", "**/*.hpp", "**/*.hh", "**/*.hxx", "**/*.h"],
+    "Dart": ["**/*.dart"],
+    "Go": ["**/*.go"],
+    "Java": ["**/*.java", "**/*.jsp"],
+    "JavaScript": ["**/*.js", "**/*.jsx", "**/*.mjs", "**/*.cjs", "**/*.vue"],
+    "Kotlin": ["**/*.kt", "**/*.kts"],
+    "PHP": ["**/*.php"],
+    "Python": ["**/*.py"],
+    "Ruby": ["**/*.rb"],
+    "Rust": ["**/*.rs"],
+    "Scala": ["**/*.scala"],
+    "Swift": ["**/*.swift"],
+    "TypeScript": ["**/*.ts", "**/*.tsx", "**/*.vue"],
+    "Vue": ["**/*.vue"],
+}
+
+MARKUP_PATTERNS = ["**/*.html", "**/*.htm", "**/*.css", "**/*.scss", "**/*.less"]
+
+DEFAULT_EXCLUSIONS = [
+    "**/node_modules/**",
+    "**/bower_components/**",
+    "**/vendor/**",
+    "**/target/**",
+    "**/build/**",
+    "**/dist/**",
+    "**/generated/**",
+    "**/generated-sources/**",
+    "**/__pycache__/**",
+    "**/.venv/**",
+    "**/venv/**",
+    "**/coverage/**",
+    "**/*.min.js",
+    "**/*.min.css",
+]
+
+
+class ScanScope:
+    def __init__(self, exclusions=None, extra_exclusions=(), analysis_cache=True) -> None:
+        """
+        Define o escopo de cada análise do SonarQube: os arquivos incluídos, a partir das linguagens do
+        repositório detectadas pelo GitHub, e os caminhos excluídos, como dependências, saídas de build e
+        código gerado. Também habilita o cache de análise do scanner, que reaproveita os resultados da
+        análise anterior do mesmo projeto para os arquivos que não mudaram.
+
+        Args:
+            exclusions (list): Padrões de caminhos excluídos. Por padrão, DEFAULT_EXCLUSIONS.
+            extra_exclusions (list): Padrões de caminhos excluídos além de exclusions.
+            analysis_cache (bool): Se o cache de análise do scanner é habilitado.
+        """
+        self.exclusions = list(DEFAULT_EXCLUSIONS if exclusions is None else exclusions)
+        self.exclusions += extra_exclusions
+        self.analysis_cache = analysis_cache
+
+    def get_inclusions(self, languages):
+        """
+        Monta os padrões dos arquivos incluídos na análise. Arquivos HTML e CSS são sempre incluídos, pois
+        são analisados pelo SonarQube mesmo sendo desconsiderados na lista de linguagens da avaliação. Se
+        alguma linguagem não for conhecida, ou se as linguagens não forem informadas, todos os arquivos são
+        incluídos.
+
+        Args:
+            languages (list): Linguagens do repositório, com os nomes usados pelo GitHub.
+
+        Returns:
+            list: Lista com os padrões dos arquivos incluídos, ou None para incluir todos os arquivos.
+        """
+        if not languages or any(language not in LANGUAGE_PATTERNS for language in languages):
+            return None
+        inclusions = []
+        for language in sorted(languages):
+            inclusions += LANGUAGE_PATTERNS[language]
+        inclusions += MARKUP_PATTERNS
+        return list(dict.fromkeys(inclusions))
+
+    def get_properties(self, languages):
+        """
+        Monta as propriedades da análise que definem o escopo e o cache.
+
+        Args:
+            languages (list): Linguagens do repositório, com os nomes usados pelo GitHub.
+
+        Returns:
+            dict: Dicionário com o nome da propriedade como chave.
+        """
+        properties = {
+            "sonar.analysisCache.enabled": str(self.analysis_cache).lower(),
+        }
+        inclusions = self.get_inclusions(languages)
+        if inclusions is not None:
+            properties["sonar.inclusions"] = ",".join(inclusions)
+        if self.exclusions:
+            properties["sonar.exclusions"] = ",".join(self.exclusions)
+        return properties
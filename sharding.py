@@ -0,0 +1,111 @@
+import argparse
+import hashlib
+import os
+
+from output_sinks import create_sink
+
+
+def get_shard(repository_name, shard_count):
+    """
+    Calcula a partição de um repositório pelo SHA-1 do nome, que é o mesmo em qualquer processo ou máquina.
+
+    Args:
+        repository_name (str): Nome do repositório.
+        shard_count (int): Quantidade de partições.
+
+    Returns:
+        int: Índice da partição, de 0 a shard_count - 1.
+    """
+    digest = hashlib.sha1(repository_name.encode("utf-8")).hexdigest()
+    return int(digest, 16) % shard_count
+
+
+def filter_shard(repository_names, shard_index, shard_count):
+    """
+    Mantém somente os repositórios de uma partição, na ordem recebida.
+
+    Args:
+        repository_names (list): Lista com os nomes dos repositórios.
+        shard_index (int): Índice da partição.
+        shard_count (int): Quantidade de partições.
+
+    Returns:
+        list: Lista com os nomes dos repositórios da partição.
+    """
+    return [
+        repository_name
+        for repository_name in repository_names
+        if get_shard(repository_name, shard_count) == shard_index
+    ]
+
+
+def get_shard_file_name(file_name, shard_index, shard_count):
+    """
+    Monta o nome do arquivo de uma partição, como "analise_shard_0_of_4" ou "journal_shard_0_of_4.jsonl".
+
+    Args:
+        file_name (str): Nome do arquivo de uma execução sem partições.
+        shard_index (int): Índice da partição.
+        shard_count (int): Quantidade de partições.
+
+    Returns:
+        str: Nome do arquivo da partição.
+    """
+    root, extension = os.path.splitext(file_name)
+    return f"{root}_shard_{shard_index}_of_{shard_count}{extension}"
+
+
+def check_shard(shard_index, shard_count):
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f"Partição inválida: shard_index={shard_index}, shard_count={shard_count}"
+        )
+
+
+def merge_shards(output_file_name, shard_count, output_formats=("csv",), has_project=False):
+    """
+    Junta as saídas de todas as partições de uma execução em uma única saída por formato, com um único
+    cabeçalho. Todas as partições precisam ter terminado.
+
+    Args:
+        output_file_name (str): Nome do arquivo final, sem extensão, o mesmo passado às partições.
+        shard_count (int): Quantidade de partições.
+        output_formats (list): Formatos das saídas das partições.
+        has_project (bool): Se as avaliações possuem a chave "cards".
+
+    Returns:
+        list: Lista com os nomes dos arquivos finais.
+    """
+    file_names = []
+    for output_format in output_formats:
+        shard_file_names = [
+            f"{get_shard_file_name(output_file_name, shard_index, shard_count)}.{output_format}"
+            for shard_index in range(shard_count)
+        ]
+        missing = [file_name for file_name in shard_file_names if not os.path.exists(file_name)]
+        if missing:
+            raise FileNotFoundError(f"Saídas de partições não encontradas: {', '.join(missing)}")
+
+        output = create_sink(output_format, output_file_name, has_project)
+        for shard_file_name in shard_file_names:
+            for record in output.read(shard_file_name):
+                output.write(record)
+        output.close()
+        file_names.append(output.file_name)
+    return file_names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Junta as saídas das partições de uma execução de make_many_evaluations."
+    )
+    parser.add_argument("output_file_name", help="Nome do arquivo final, sem extensão.")
+    parser.add_argument("--shard-count", type=int, required=True)
+    parser.add_argument("--formats", nargs="+", default=["csv"])
+    parser.add_argument("--has-project", action="store_true")
+    args = parser.parse_args()
+
+    for file_name in merge_shards(
+        args.output_file_name, args.shard_count, args.formats, args.has_project
+    ):
+        print(file_name)
@@ -1,16 +1,40 @@
 import os
+import shutil
+import stat
 from typing import Dict
 import dotenv
-import requests
-import json
 import time
+from sonar_task_tracker import CeTaskTracker, read_report_task
+from sonar_measures import METRIC_KEYS, SonarMeasuresClient
+from run_metrics import RunMetrics
 
 dotenv.load_dotenv("./.env", override=True)
 
 
 class SonarEvaluations:
-    def __init__(self, sonar_token, project_name, github_url) -> None:
+    def __init__(
+        self,
+        sonar_token,
+        project_name,
+        github_url,
+        clone_cache=None,
+        scanner=None,
+        tracker=None,
+        measures_client=None,
+        metrics=None,
+        scan_scope=None,
+        languages=None,
+        project_manager=None,
+    ) -> None:
         self.sonar_token = sonar_token
+        self.measures_client = measures_client or SonarMeasuresClient(sonar_token)
+        self.tracker = tracker
+        self.metrics = metrics or RunMetrics()
+        self.scan_scope = scan_scope
+        self.languages = languages
+        self.project_manager = project_manager
+        self.clone_cache = clone_cache
+        self.scanner = scanner
         self.project_key = project_name
         self.project_name = project_name
         self.github_url = github_url
@@ -23,47 +47,63 @@ class SonarEvaluations:
             dict: Um dicionário contendo métricas como número total de issues, quantidade de issues por severidade,
                   porcentagem de duplicação de código, quantidade de hotspots de segurança, entre outras.
         """
-        self.create_sonar_project()
-        self.create_sonar_project_properties()
-        self.dowload_github_files(self.github_url)
-        self.make_sonarqube_analysis()
+        self.run_analysis()
+        with self.metrics.measure(self.project_name, "measures"):
+            measures = self.measures_client.get_measures(self.project_key)
+        return self.get_evaluation(measures)
 
-        analysis_ready = False
+    def run_analysis(self):
+        """
+        Cria o projeto no SonarQube, executa a análise e aguarda sua conclusão. Se houver um gerenciador de
+        projetos com retenção de análises, remove as análises antigas do projeto.
 
-        while not analysis_ready:
-            analysis = self.make_request(
-                "project_analyses/search", f"project={self.project_key}"
-            )["analyses"]
-            if analysis != []:
-                analysis_ready = True
-            time.sleep(1)
+        Returns:
+            None
+        """
+        self.create_sonar_project()
+        if self.scanner is None:
+            previous_analysis = self.get_last_analysis_key()
+            self.create_sonar_project_properties()
+            with self.metrics.measure(self.project_name, "clone"):
+                self.dowload_github_files(self.github_url)
+            with self.metrics.measure(self.project_name, "scan"):
+                self.make_sonarqube_analysis()
+            with self.metrics.measure(self.project_name, "ce_wait"):
+                self.wait_for_new_analysis(previous_analysis)
+        else:
+            self.make_scanner_analysis()
+        if self.project_manager is not None:
+            self.project_manager.apply_retention(self.project_key)
+
+    def get_evaluation(self, measures):
+        """
+        Calcula as métricas de qualidade de código da avaliação a partir das métricas do projeto.
 
-        code_duplication = self.get_code_duplication()
-        maintainability_issues = self.get_quantity_of_maintainability_issues()
-        reliability_issues = self.get_quantity_of_reliability_issues()
-        security_issues = self.get_quantity_of_security_issues()
+        Args:
+            measures (SonarMeasures): Métricas do projeto retornadas pelo SonarQube.
 
+        Returns:
+            dict: Um dicionário contendo métricas como número total de issues, quantidade de issues por severidade,
+                  porcentagem de duplicação de código, quantidade de hotspots de segurança, entre outras.
+        """
         issues_per_severity = self.check_issues_per_severity_quantity(
-            maintainability_issues, reliability_issues, security_issues
+            measures.maintainability_issues,
+            measures.reliability_issues,
+            measures.security_issues,
         )
-        total_of_issues = issues_per_severity["total"]
         issues_per_severity_percentage = self.get_percentage_of_values(
             issues_per_severity
         )
-        quantity_of_security_hotspots = self.get_quantity_of_security_hotspots()
-        quantity_of_bugs = self.get_bug_issues()
-        quantity_of_vulnerabilities = self.get_vulnerabiity_issues()
-        quantity_of_code_smells = self.get_code_smells_issues()
 
         return {
-            "issues_total": total_of_issues,
+            "issues_total": issues_per_severity["total"],
             "issues_per_severity_quantity": issues_per_severity,
             "issues_per_severity_percentage": issues_per_severity_percentage,
-            "percentage_of_code_duplication": code_duplication,
-            "quantity_of_security_hotspots": quantity_of_security_hotspots,
-            "quantity_of_bugs": quantity_of_bugs,
-            "quantity_of_vulnerabilities": quantity_of_vulnerabilities,
-            "quantity_of_code_smells": quantity_of_code_smells,
+            "percentage_of_code_duplication": measures.duplicated_lines_density,
+            "quantity_of_security_hotspots": measures.security_hotspots,
+            "quantity_of_bugs": measures.bugs,
+            "quantity_of_vulnerabilities": measures.vulnerabilities,
+            "quantity_of_code_smells": measures.code_smells,
         }
 
     def make_request(self, extra_path, query):
@@ -77,29 +117,32 @@ class SonarEvaluations:
         Returns:
             dict: Resposta da requisição em formato JSON.
         """
-        response = requests.get(
-            f"http://localhost:9000/api/{extra_path}?{query}",
-            headers={"Authorization": f"Bearer {self.sonar_token}"},
+        response = self.measures_client.session.get(
+            f"{self.measures_client.sonar_url}/api/{extra_path}?{query}"
         )
         json_of_response = response.json()
         return json_of_response
 
     def create_sonar_project(self):
         """
-        Cria um projeto no SonarQube.
+        Cria um projeto no SonarQube. Com um gerenciador de projetos, o projeto só é criado se ainda não existir.
 
         Returns:
             None
         """
-        requests.post(
-            f"http://localhost:9000/api/projects/create?project={self.project_name}&name={self.project_key}",
-            headers={"Authorization": f"Bearer {self.sonar_token}"},
+        if self.project_manager is not None:
+            self.project_manager.ensure_project(self.project_key, self.project_name)
+            return
+        self.measures_client.session.post(
+            f"{self.measures_client.sonar_url}/api/projects/create?project={self.project_name}&name={self.project_key}"
         )
 
     def dowload_github_files(self, github_url, repository_path="github_repository"):
         """
         Baixa os arquivos do repositório GitHub e coloca na pasta correta para análise do SonarQube,
-        além de fazer o tratamento e apagar os arquivos para baixar os próximos.
+        além de fazer o tratamento e apagar os arquivos para baixar os próximos. Se houver um cache de
+        clones, os arquivos vêm de um checkout do clone do cache, atualizado com git fetch, ao invés de
+        um novo git clone.
 
         Args:
             github_url (str): URL do repositório GitHub.
@@ -109,157 +152,158 @@ class SonarEvaluations:
             None
         """
         if os.path.exists(repository_path):
-            os.system(f"rmdir /s /q {repository_path}")
-        os.mkdir("github_repository")
-        os.system(f"cd {repository_path} && git clone {github_url}")
+            shutil.rmtree(repository_path, onerror=self.remove_read_only)
+        os.makedirs(repository_path)
+        if self.clone_cache is None:
+            os.system(f"cd {repository_path} && git clone {github_url}")
+            return
+        repository_name = github_url.rstrip("/").split("/")[-1]
+        self.clone_cache.add_worktree(
+            github_url, os.path.join(repository_path, repository_name)
+        )
 
-    def make_sonarqube_analysis(self):
+    def remove_read_only(self, function, path, _):
         """
-        Realiza uma análise do projeto no SonarQube, baseado no docker-compose configurado.
+        Remove a proteção de somente leitura de um arquivo (como os objetos do git no Windows) e
+        repete a remoção.
 
         Returns:
             None
         """
-        os.system("docker-compose up --build")
+        os.chmod(path, stat.S_IWRITE)
+        function(path)
 
-    def create_sonar_project_properties(
-        self,
-        sonar_sources="./github_repository",
-        sonar_host_url="http://sonarqube:9000",
-    ):
+    def make_sonarqube_analysis(self):
         """
-        Cria o arquivo de propriedades do projeto SonarQube.
-
-        Args:
-            sonar_sources (str): Caminho para os arquivos fonte do projeto.
-            sonar_host_url (str): URL do host do SonarQube.
+        Realiza uma análise do projeto no SonarQube, baseado no docker-compose configurado.
 
         Returns:
             None
         """
-        with open("sonar-project.properties", "w") as file:
-            file.write("sonar.scm.exclusions.disabled=true\n")
-            file.write(f"sonar.sources={sonar_sources}\n")
-            file.write(f"sonar.token={self.sonar_token}\n")
-            file.write(f"sonar.host.url={sonar_host_url}\n")
-            file.write(f"sonar.projectKey={self.project_key}\n")
-
-    def get_value_of_component_response(self, response):
-        """
-        Obtém o valor de uma resposta de componente.
-
-        Args:
-            response (dict): Resposta da requisição em formato JSON.
-
-        Returns:
-            dict: dicionário com dados retornados pelo json.
-        """
-        response = response["component"]["measures"]
-        return response[0]["value"] if len(response) > 0 else 0
+        os.system("docker-compose up --build")
 
-    def get_code_duplication(self):
+    def make_scanner_analysis(self):
         """
-        Obtém a porcentagem de duplicação de código.
+        Realiza a análise do projeto com os workers de análise, em uma pasta de trabalho própria do projeto
+        e com as propriedades passadas na execução, permitindo várias análises ao mesmo tempo. Aguarda a
+        tarefa do Compute Engine identificada pelo ceTaskId do arquivo report-task.txt.
 
         Returns:
-            float: Porcentagem de duplicação de código.
+            None
         """
-        code_duplication = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=duplicated_lines_density",
+        workspace = self.scanner.get_workspace(self.project_key)
+        with self.metrics.measure(self.project_name, "clone"):
+            self.dowload_github_files(self.github_url, workspace)
+        repository_name = self.github_url.rstrip("/").split("/")[-1]
+        properties = self.get_sonar_project_properties(
+            sonar_sources=repository_name, sonar_host_url=self.scanner.runner.host_url
         )
-        return self.get_value_of_component_response(code_duplication)
-
-    def get_quantity_of_reliability_issues(self):
-        """
-        Obtém a quantidade de issues de confiabilidade.
+        del properties["sonar.token"]
+        with self.metrics.measure(self.project_name, "scan"):
+            self.scanner.scan(workspace, properties, self.sonar_token)
 
-        Returns:
-            dict: Quantidade de issues de confiabilidade, separado em chaves que dizem o nível severidade e valor com quantidade.
-        """
-        reliability_issues = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=reliability_issues",
-        )
-        return self.get_value_of_component_response(reliability_issues)
+        if self.tracker is None:
+            self.tracker = CeTaskTracker(self.sonar_token)
+        with self.metrics.measure(self.project_name, "ce_wait"):
+            self.tracker.wait(read_report_task(workspace)["ceTaskId"])
 
-    def get_quantity_of_security_issues(self):
+    def get_last_analysis_key(self):
         """
-        Obtém a quantidade de issues de segurança.
+        Busca a chave da análise mais recente do projeto.
 
         Returns:
-            int: Quantidade de issues de segurança, separado em chaves que dizem o nível severidade e valor com quantidade..
-        """
-        security_issues = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=security_issues",
-        )
-        return self.get_value_of_component_response(security_issues)
-
-    def get_quantity_of_maintainability_issues(self):
+            str: Chave da análise, ou None se o projeto ainda não tiver análises.
         """
-        Obtém a quantidade de issues de manutenibilidade.
+        analyses = self.make_request(
+            "project_analyses/search", f"project={self.project_key}&ps=1"
+        ).get("analyses", [])
+        return analyses[0]["key"] if analyses else None
 
-        Returns:
-            int: Quantidade de issues de manutenibilidade, separado em chaves que dizem o nível severidade e valor com quantidade..
+    def wait_for_new_analysis(self, previous_analysis, timeout=3600, max_delay=30):
         """
-        maintainability_issues = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=maintainability_issues",
-        )
-        return self.get_value_of_component_response(maintainability_issues)
+        Aguarda até que o projeto tenha uma análise diferente da anterior à execução do scanner, com
+        intervalo exponencial entre as consultas. Usado quando o ceTaskId da análise não está disponível.
 
-    def get_quantity_of_security_hotspots(self):
-        """
-        Obtém a quantidade de hotspots de segurança.
+        Args:
+            previous_analysis (str): Chave da análise mais recente antes da execução do scanner.
+            timeout (float): Tempo máximo de espera, em segundos.
+            max_delay (float): Intervalo máximo entre consultas, em segundos.
 
         Returns:
-            int: Quantidade de hotspots de segurança.
+            None
         """
-        security_hotspots = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=security_hotspots",
-        )
-        return self.get_value_of_component_response(security_hotspots)
+        deadline = time.time() + timeout
+        delay = 1
+        while self.get_last_analysis_key() in (None, previous_analysis):
+            if time.time() + delay > deadline:
+                raise TimeoutError(f"Análise do projeto {self.project_key} não concluída")
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
 
-    def get_bug_issues(self):
+    def get_scanner_configuration(self):
         """
-        Obtém a quantidade de issues de bugs.
+        Monta a configuração do scanner que influencia o resultado da análise, sem o token e a URL do SonarQube.
 
         Returns:
-            int: Quantidade de issues de bugs.
+            dict: Propriedades da análise, forma de execução do scanner e métricas buscadas.
         """
-        bugs = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=bugs",
-        )
-        return self.get_value_of_component_response(bugs)
+        properties = self.get_sonar_project_properties()
+        del properties["sonar.token"]
+        del properties["sonar.host.url"]
+        runner = None if self.scanner is None else self.scanner.runner
+        return {
+            "properties": properties,
+            "runner": type(runner).__name__ if runner else "docker-compose",
+            "image": getattr(runner, "image", None),
+            "metrics": list(METRIC_KEYS),
+        }
 
-    def get_code_smells_issues(self):
+    def get_sonar_project_properties(
+        self,
+        sonar_sources="./github_repository",
+        sonar_host_url="http://sonarqube:9000",
+    ):
         """
-        Obtém a quantidade de issues de smells de código.
+        Monta as propriedades da análise do projeto no SonarQube. Se houver um escopo de análise, as
+        propriedades de inclusão, exclusão e cache são montadas a partir das linguagens do repositório.
+
+        Args:
+            sonar_sources (str): Caminho para os arquivos fonte do projeto.
+            sonar_host_url (str): URL do host do SonarQube.
 
         Returns:
-            int: Quantidade de issues de smells de código.
-        """
-        code_smells = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=code_smells",
-        )
-        return self.get_value_of_component_response(code_smells)
+            dict: Dicionário com o nome da propriedade como chave.
+        """
+        properties = {
+            "sonar.scm.exclusions.disabled": "true",
+            "sonar.sources": sonar_sources,
+            "sonar.token": self.sonar_token,
+            "sonar.host.url": sonar_host_url,
+            "sonar.projectKey": self.project_key,
+        }
+        if self.scan_scope is not None:
+            properties.update(self.scan_scope.get_properties(self.languages))
+        return properties
 
-    def get_vulnerabiity_issues(self):
+    def create_sonar_project_properties(
+        self,
+        sonar_sources="./github_repository",
+        sonar_host_url="http://sonarqube:9000",
+    ):
         """
-        Obtém a quantidade de issues de vulnerabilidades.
+        Cria o arquivo de propriedades do projeto SonarQube.
+
+        Args:
+            sonar_sources (str): Caminho para os arquivos fonte do projeto.
+            sonar_host_url (str): URL do host do SonarQube.
 
         Returns:
-            int: Quantidade de issues de vulnerabilidades.
+            None
         """
-        vulnerability_issues = self.make_request(
-            extra_path="measures/component",
-            query=f"component={self.project_key}&metricKeys=vulnerabilities",
-        )
-        return self.get_value_of_component_response(vulnerability_issues)
+        properties = self.get_sonar_project_properties(sonar_sources, sonar_host_url)
+        with open("sonar-project.properties", "w") as file:
+            for key, value in properties.items():
+                file.write(f"{key}={value}\n")
 
     def check_issues_per_severity_quantity(
         self, maintainability_issues, reliability_issues, security_issues
@@ -268,17 +312,13 @@ class SonarEvaluations:
         Verifica a quantidade de issues por severidade de todos os tipos de issue.
 
         Args:
-            maintainability_issues (int): Quantidade de issues de manutenibilidade.
-            reliability_issues (int): Quantidade de issues de confiabilidade.
-            security_issues (int): Quantidade de issues de segurança.
+            maintainability_issues (dict): Quantidade de issues de manutenibilidade por severidade.
+            reliability_issues (dict): Quantidade de issues de confiabilidade por severidade.
+            security_issues (dict): Quantidade de issues de segurança por severidade.
 
         Returns:
             dict: Um dicionário contendo a quantidade de issues por severidade.
         """
-        maintainability_issues = json.loads(maintainability_issues)
-        reliability_issues = json.loads(reliability_issues)
-        security_issues = json.loads(security_issues)
-
         total_low = (
             maintainability_issues["LOW"]
             + reliability_issues["LOW"]
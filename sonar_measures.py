@@ -0,0 +1,122 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+METRIC_KEYS = (
+    "duplicated_lines_density",
+    "maintainability_issues",
+    "reliability_issues",
+    "security_issues",
+    "security_hotspots",
+    "bugs",
+    "code_smells",
+    "vulnerabilities",
+)
+
+SEARCH_PROJECTS_LIMIT = 100
+
+
+def create_empty_issues():
+    return {"LOW": 0, "MEDIUM": 0, "HIGH": 0, "total": 0}
+
+
+@dataclass
+class SonarMeasures:
+    duplicated_lines_density: float = 0
+    maintainability_issues: Dict[str, int] = field(default_factory=create_empty_issues)
+    reliability_issues: Dict[str, int] = field(default_factory=create_empty_issues)
+    security_issues: Dict[str, int] = field(default_factory=create_empty_issues)
+    security_hotspots: int = 0
+    bugs: int = 0
+    code_smells: int = 0
+    vulnerabilities: int = 0
+
+    def set_value(self, metric, value):
+        """
+        Converte o valor de uma métrica retornado pela API para o tipo do campo correspondente.
+
+        Args:
+            metric (str): Chave da métrica.
+            value (str): Valor retornado pela API.
+
+        Returns:
+            None
+        """
+        if metric == "duplicated_lines_density":
+            setattr(self, metric, float(value))
+        elif metric.endswith("_issues"):
+            issues = json.loads(value)
+            setattr(
+                self,
+                metric,
+                {key: issues.get(key, 0) for key in create_empty_issues()},
+            )
+        else:
+            setattr(self, metric, int(value))
+
+
+class SonarMeasuresClient:
+    def __init__(self, sonar_token, sonar_url="http://localhost:9000", max_connections=10) -> None:
+        """
+        Busca as métricas dos projetos no SonarQube com uma única requisição por projeto, ou com uma
+        requisição para até 100 projetos, reaproveitando as conexões de uma sessão compartilhada.
+
+        Args:
+            sonar_token (str): Token do SonarQube.
+            sonar_url (str): URL do SonarQube.
+            max_connections (int): Quantidade de conexões mantidas abertas com o SonarQube.
+        """
+        self.sonar_url = sonar_url
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=max_connections))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=max_connections))
+        self.session.headers.update({"Authorization": f"Bearer {sonar_token}"})
+
+    def get_measures(self, project_key):
+        """
+        Busca todas as métricas de um projeto em uma única requisição a api/measures/component.
+
+        Args:
+            project_key (str): Chave do projeto no SonarQube.
+
+        Returns:
+            SonarMeasures: Métricas do projeto.
+        """
+        response = self.session.get(
+            f"{self.sonar_url}/api/measures/component",
+            params={"component": project_key, "metricKeys": ",".join(METRIC_KEYS)},
+        )
+        response.raise_for_status()
+        measures = SonarMeasures()
+        for measure in response.json()["component"]["measures"]:
+            if "value" in measure:
+                measures.set_value(measure["metric"], measure["value"])
+        return measures
+
+    def search_measures(self, project_keys):
+        """
+        Busca as métricas de vários projetos com api/measures/search, em requisições de até 100 projetos.
+
+        Args:
+            project_keys (list): Lista com as chaves dos projetos no SonarQube.
+
+        Returns:
+            dict: Dicionário com a chave do projeto como chave e as métricas (SonarMeasures) como valor.
+        """
+        result = {project_key: SonarMeasures() for project_key in project_keys}
+        for start in range(0, len(project_keys), SEARCH_PROJECTS_LIMIT):
+            response = self.session.get(
+                f"{self.sonar_url}/api/measures/search",
+                params={
+                    "projectKeys": ",".join(project_keys[start : start + SEARCH_PROJECTS_LIMIT]),
+                    "metricKeys": ",".join(METRIC_KEYS),
+                },
+            )
+            response.raise_for_status()
+            for measure in response.json()["measures"]:
+                if "value" in measure:
+                    result[measure["component"]].set_value(measure["metric"], measure["value"])
+        return result
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+
+SEARCH_PAGE_SIZE = 500
+DELETE_BATCH_SIZE = 50
+
+
+class SonarProjectManager:
+    def __init__(
+        self,
+        measures_client,
+        analysis_retention=None,
+        owner=None,
+        provisioned_file=".sonar_projects.json",
+    ) -> None:
+        """
+        Gerencia os projetos do SonarQube: lista os projetos existentes uma única vez, cria somente os que
+        faltam, remove em lote os projetos criados pelo bot que não são mais usados e mantém somente as
+        análises mais recentes de cada projeto. As chaves dos projetos criados são salvas em provisioned_file,
+        separadas por owner, e somente elas podem ser removidas.
+
+        Args:
+            measures_client (SonarMeasuresClient): Cliente cuja sessão e URL são usadas nas requisições.
+            analysis_retention (int): Quantidade de análises mantidas em cada projeto, ou None para manter todas.
+            owner (str): Organização ou usuário dono dos repositórios avaliados.
+            provisioned_file (str): Nome do arquivo json com as chaves dos projetos criados pelo bot.
+        """
+        self.session = measures_client.session
+        self.sonar_url = measures_client.sonar_url
+        self.analysis_retention = analysis_retention
+        self.owner = owner
+        self.provisioned_file = provisioned_file
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.project_keys = None
+        self.can_list = True
+        self.provisioned = {}
+        if provisioned_file and os.path.exists(provisioned_file):
+            with open(provisioned_file, encoding="utf-8") as file:
+                self.provisioned = json.load(file)
+
+    def get_provisioned_keys(self):
+        """
+        Lista as chaves dos projetos criados pelo bot para o owner.
+
+        Returns:
+            set: Conjunto com as chaves dos projetos.
+        """
+        with self.lock:
+            return set(self.provisioned.get(self.owner or "", []))
+
+    def update_provisioned_keys(self, added=(), removed=()):
+        """
+        Adiciona e remove chaves dos projetos criados pelo bot para o owner, e salva o arquivo de forma atômica.
+
+        Args:
+            added (Iterable[str]): Chaves dos projetos criados.
+            removed (Iterable[str]): Chaves dos projetos removidos.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            project_keys = set(self.provisioned.get(self.owner or "", []))
+            project_keys.update(added)
+            project_keys.difference_update(removed)
+            self.provisioned[self.owner or ""] = sorted(project_keys)
+            if not self.provisioned_file:
+                return
+            temporary_file_name = f"{self.provisioned_file}.tmp"
+            with open(temporary_file_name, "w", encoding="utf-8") as file:
+                json.dump(self.provisioned, file)
+            os.replace(temporary_file_name, self.provisioned_file)
+
+    def load(self):
+        """
+        Lista as chaves de todos os projetos do SonarQube com api/projects/search, página a página. O endpoint
+        exige a permissão "Administer System"; sem ela (resposta 401 ou 403), os projetos deixam de ser
+        listados e ensure_project sempre tenta criar o projeto.
+
+        Returns:
+            set: Conjunto com as chaves dos projetos, ou None se o token não pode listar os projetos.
+        """
+        project_keys = set()
+        page = 1
+        while True:
+            response = self.session.get(
+                f"{self.sonar_url}/api/projects/search",
+                params={"ps": SEARCH_PAGE_SIZE, "p": page},
+            )
+            if response.status_code in (401, 403):
+                with self.lock:
+                    self.can_list = False
+                return None
+            response.raise_for_status()
+            body = response.json()
+            project_keys.update(component["key"] for component in body["components"])
+            if page * SEARCH_PAGE_SIZE >= body["paging"]["total"]:
+                break
+            page += 1
+        with self.lock:
+            self.project_keys = project_keys
+        return project_keys
+
+    def load_once(self):
+        with self.load_lock:
+            if self.project_keys is None and self.can_list:
+                self.load()
+
+    def ensure_project(self, project_key, project_name):
+        """
+        Cria o projeto no SonarQube se ele ainda não existir. Uma resposta 400 (projeto criado depois da
+        listagem, ou já existente quando os projetos não podem ser listados) é tratada como projeto existente.
+
+        Args:
+            project_key (str): Chave do projeto.
+            project_name (str): Nome do projeto.
+
+        Returns:
+            bool: True se o projeto foi criado, False se já existia.
+        """
+        self.load_once()
+        with self.lock:
+            if self.project_keys is not None:
+                if project_key in self.project_keys:
+                    return False
+                self.project_keys.add(project_key)
+        response = self.session.post(
+            f"{self.sonar_url}/api/projects/create",
+            params={"project": project_key, "name": project_name},
+        )
+        if response.status_code == 400:
+            return False
+        if not response.ok:
+            with self.lock:
+                if self.project_keys is not None:
+                    self.project_keys.discard(project_key)
+            response.raise_for_status()
+        self.update_provisioned_keys(added=[project_key])
+        return True
+
+    def prune(self, keep):
+        """
+        Remove em lote, com api/projects/bulk_delete, os projetos criados pelo bot para o owner que não estão
+        em keep. Projetos criados de outra forma, ou para outro owner, nunca são removidos.
+
+        Args:
+            keep (Iterable[str]): Chaves dos projetos mantidos.
+
+        Returns:
+            list: Lista com as chaves dos projetos removidos.
+        """
+        keep = set(keep)
+        if not keep:
+            raise ValueError("A lista de projetos mantidos está vazia; nenhum projeto foi removido.")
+        self.load_once()
+        provisioned = self.get_provisioned_keys()
+        with self.lock:
+            existing = provisioned if self.project_keys is None else self.project_keys
+            removed = sorted(provisioned.intersection(existing).difference(keep))
+        for start in range(0, len(removed), DELETE_BATCH_SIZE):
+            response = self.session.post(
+                f"{self.sonar_url}/api/projects/bulk_delete",
+                data={"projects": ",".join(removed[start : start + DELETE_BATCH_SIZE])},
+            )
+            response.raise_for_status()
+        with self.lock:
+            if self.project_keys is not None:
+                self.project_keys.difference_update(removed)
+        self.update_provisioned_keys(removed=removed)
+        return removed
+
+    def apply_retention(self, project_key):
+        """
+        Remove, com api/project_analyses/delete, as análises do projeto além das analysis_retention mais recentes.
+
+        Args:
+            project_key (str): Chave do projeto.
+
+        Returns:
+            list: Lista com as chaves das análises removidas.
+        """
+        if self.analysis_retention is None:
+            return []
+        analyses = []
+        page = 1
+        while True:
+            response = self.session.get(
+                f"{self.sonar_url}/api/project_analyses/search",
+                params={"project": project_key, "ps": SEARCH_PAGE_SIZE, "p": page},
+            )
+            response.raise_for_status()
+            body = response.json()
+            analyses += [analysis["key"] for analysis in body["analyses"]]
+            if page * SEARCH_PAGE_SIZE >= body["paging"]["total"]:
+                break
+            page += 1
+
+        removed = analyses[max(self.analysis_retention, 1) :]
+        for analysis_key in removed:
+            response = self.session.post(
+                f"{self.sonar_url}/api/project_analyses/delete",
+                data={"analysis": analysis_key},
+            )
+            response.raise_for_status()
+        return removed
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import threading
+
+
+class SonarResultCache:
+    def __init__(self, directory=".sonar_result_cache") -> None:
+        """
+        Cache em disco das métricas do SonarQube, indexado pelo repositório, pelo commit analisado (HEAD) e
+        pela configuração do scanner. Se nenhum dos três mudou desde a última execução, a análise pode ser
+        reaproveitada sem clonar, analisar e buscar as métricas novamente.
+
+        Args:
+            directory (str): Pasta onde os resultados são salvos.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, repository_name, head_sha, scanner_configuration):
+        """
+        Gera a chave de um resultado.
+
+        Args:
+            repository_name (str): Nome do repositório.
+            head_sha (str): SHA do commit analisado.
+            scanner_configuration (dict): Configuração do scanner que influencia o resultado da análise.
+
+        Returns:
+            str: Chave do resultado.
+        """
+        content = json.dumps(
+            [repository_name, head_sha, scanner_configuration], sort_keys=True
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Busca um resultado salvo.
+
+        Args:
+            key (str): Chave do resultado.
+
+        Returns:
+            dict: Métricas retornadas por SonarEvaluations.get_evaluation, ou None se não existir.
+        """
+        try:
+            with open(self.get_path(key), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, sonar_analysis):
+        """
+        Salva um resultado de forma atômica.
+
+        Args:
+            key (str): Chave do resultado.
+            sonar_analysis (dict): Métricas retornadas por SonarEvaluations.get_evaluation.
+
+        Returns:
+            None
+        """
+        path = self.get_path(key)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(sonar_analysis, file)
+        os.replace(temporary_path, path)
+
+    def get_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
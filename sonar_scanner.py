@@ -0,0 +1,144 @@
+import os
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+
+
+class ScannerRunner(ABC):
+    host_url = "http://localhost:9000"
+
+    @abstractmethod
+    def run(self, workspace, properties, sonar_token):
+        """
+        Executa o sonar-scanner em uma pasta de trabalho.
+
+        Args:
+            workspace (str): Pasta base do projeto analisado (sonar.projectBaseDir).
+            properties (dict): Propriedades da análise, passadas como -Dchave=valor.
+            sonar_token (str): Token do SonarQube, passado pela variável de ambiente SONAR_TOKEN.
+
+        Returns:
+            None
+        """
+
+    def get_arguments(self, properties):
+        return [f"-D{key}={value}" for key, value in properties.items()]
+
+
+class DockerScannerRunner(ScannerRunner):
+    def __init__(
+        self,
+        image="sonarsource/sonar-scanner-cli:10",
+        network="sonarnet",
+        host_url="http://sonarqube:9000",
+        cache_volume="sonar-scanner-cache",
+    ) -> None:
+        """
+        Executa cada análise em um container descartável da imagem do sonar-scanner, sem gerar uma nova
+        imagem. A pasta de trabalho é montada como volume e as propriedades são passadas na execução.
+        A pasta de cache do scanner (plugins e JRE baixados do SonarQube) fica em um volume do Docker,
+        mantido entre as análises.
+
+        Args:
+            image (str): Imagem do sonar-scanner.
+            network (str): Rede do Docker onde o SonarQube está rodando.
+            host_url (str): URL do SonarQube vista de dentro da rede do Docker.
+            cache_volume (str): Nome do volume (ou caminho) da pasta de cache do scanner, ou None para
+            não manter o cache.
+        """
+        self.image = image
+        self.network = network
+        self.host_url = host_url
+        self.cache_volume = cache_volume
+
+    def run(self, workspace, properties, sonar_token):
+        cache_args = []
+        if self.cache_volume:
+            cache_args = ["-v", f"{self.cache_volume}:/opt/sonar-scanner/.sonar/cache"]
+        subprocess.run(
+            [
+                "docker",
+                "run",
+                "--rm",
+                "--network",
+                self.network,
+                "-e",
+                "SONAR_TOKEN",
+                "-v",
+                f"{os.path.abspath(workspace)}:/usr/src",
+                *cache_args,
+                self.image,
+                *self.get_arguments({**properties, "sonar.projectBaseDir": "/usr/src"}),
+            ],
+            check=True,
+            env={**os.environ, "SONAR_TOKEN": sonar_token},
+        )
+
+
+class LocalScannerRunner(ScannerRunner):
+    def __init__(self, executable="sonar-scanner", host_url="http://localhost:9000") -> None:
+        """
+        Executa cada análise com um sonar-scanner instalado na própria máquina, sem Docker.
+
+        Args:
+            executable (str): Caminho ou nome do executável do sonar-scanner.
+            host_url (str): URL do SonarQube.
+        """
+        self.executable = executable
+        self.host_url = host_url
+
+    def run(self, workspace, properties, sonar_token):
+        workspace = os.path.abspath(workspace)
+        subprocess.run(
+            [
+                self.executable,
+                *self.get_arguments({**properties, "sonar.projectBaseDir": workspace}),
+            ],
+            check=True,
+            cwd=workspace,
+            env={**os.environ, "SONAR_TOKEN": sonar_token},
+        )
+
+
+class ScannerPool:
+    def __init__(self, runner=None, max_scans=2, workspace_directory="workspaces") -> None:
+        """
+        Conjunto de workers de análise que compartilham o mesmo SonarQube. Cada análise usa uma pasta de
+        trabalho própria, e no máximo max_scans análises são executadas ao mesmo tempo.
+
+        Args:
+            runner (ScannerRunner): Forma de execução do sonar-scanner. Por padrão, DockerScannerRunner.
+            max_scans (int): Quantidade máxima de análises executadas ao mesmo tempo.
+            workspace_directory (str): Pasta onde as pastas de trabalho de cada projeto são criadas.
+        """
+        self.runner = runner or DockerScannerRunner()
+        self.max_scans = max_scans
+        self.workspace_directory = workspace_directory
+        self.semaphore = threading.Semaphore(max_scans)
+
+    def get_workspace(self, project_key):
+        """
+        Monta o caminho da pasta de trabalho de um projeto.
+
+        Args:
+            project_key (str): Chave do projeto no SonarQube.
+
+        Returns:
+            str: Caminho da pasta de trabalho.
+        """
+        return os.path.join(self.workspace_directory, project_key)
+
+    def scan(self, workspace, properties, sonar_token):
+        """
+        Executa uma análise, aguardando uma vaga caso max_scans análises já estejam em andamento.
+
+        Args:
+            workspace (str): Pasta de trabalho do projeto.
+            properties (dict): Propriedades da análise.
+            sonar_token (str): Token do SonarQube.
+
+        Returns:
+            None
+        """
+        with self.semaphore:
+            self.runner.run(workspace, properties, sonar_token)
@@ -0,0 +1,230 @@
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+FINAL_STATUSES = {"SUCCESS", "FAILED", "CANCELED"}
+
+
+def read_report_task(workspace):
+    """
+    Lê o arquivo report-task.txt gerado pelo sonar-scanner ao final do envio da análise.
+
+    Args:
+        workspace (str): Pasta base do projeto analisado.
+
+    Returns:
+        dict: Dicionário com as chaves do arquivo, como "ceTaskId", "projectKey" e "serverUrl".
+    """
+    report = {}
+    with open(os.path.join(workspace, ".scannerwork", "report-task.txt"), encoding="utf-8") as file:
+        for line in file:
+            key, separator, value = line.rstrip("\n").partition("=")
+            if separator:
+                report[key] = value
+    return report
+
+
+class CeTaskTracker:
+    def __init__(
+        self,
+        sonar_token,
+        sonar_url="http://localhost:9000",
+        initial_delay=1,
+        max_delay=30,
+        timeout=3600,
+    ) -> None:
+        """
+        Acompanha as tarefas do Compute Engine do SonarQube pelo ceTaskId de cada análise. Uma única thread
+        consulta api/ce/task para todas as tarefas em andamento, com intervalo exponencial entre consultas
+        de cada tarefa, e as tarefas também podem ser finalizadas pelo WebhookReceiver.
+
+        Args:
+            sonar_token (str): Token do SonarQube.
+            sonar_url (str): URL do SonarQube.
+            initial_delay (float): Intervalo, em segundos, até a primeira consulta de uma tarefa.
+            max_delay (float): Intervalo máximo, em segundos, entre consultas de uma tarefa.
+            timeout (float): Tempo máximo, em segundos, de espera por uma tarefa.
+        """
+        self.sonar_url = sonar_url
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {sonar_token}"})
+        self.condition = threading.Condition()
+        self.tasks = {}
+        self.poller = None
+
+    def wait(self, task_id):
+        """
+        Aguarda a conclusão de uma tarefa do Compute Engine.
+
+        Args:
+            task_id (str): ceTaskId da análise.
+
+        Returns:
+            dict: Dados da tarefa retornados por api/ce/task, com status SUCCESS.
+        """
+        return self.wait_many([task_id])[task_id]
+
+    def wait_many(self, task_ids):
+        """
+        Aguarda a conclusão de várias tarefas do Compute Engine ao mesmo tempo.
+
+        Args:
+            task_ids (list): Lista de ceTaskId.
+
+        Returns:
+            dict: Dicionário com o ceTaskId como chave e os dados da tarefa como valor.
+        """
+        deadline = time.time() + self.timeout
+        with self.condition:
+            for task_id in task_ids:
+                self.tasks.setdefault(
+                    task_id,
+                    {
+                        "result": None,
+                        "delay": self.initial_delay,
+                        "next_poll": time.time() + self.initial_delay,
+                    },
+                )
+            if self.poller is None or not self.poller.is_alive():
+                self.poller = threading.Thread(target=self.poll, daemon=True)
+                self.poller.start()
+            self.condition.notify_all()
+
+            while any(self.tasks[task_id]["result"] is None for task_id in task_ids):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    for task_id in task_ids:
+                        self.tasks.pop(task_id, None)
+                    raise TimeoutError(f"Análises não concluídas no SonarQube: {task_ids}")
+                self.condition.wait(remaining)
+            results = {task_id: self.tasks.pop(task_id)["result"] for task_id in task_ids}
+
+        for task_id, task in results.items():
+            if task["status"] != "SUCCESS":
+                raise RuntimeError(f"Análise {task_id} terminou com status {task['status']}")
+        return results
+
+    def complete(self, task_id, task):
+        """
+        Registra o resultado de uma tarefa e acorda quem estiver aguardando por ela.
+
+        Args:
+            task_id (str): ceTaskId da análise.
+            task (dict): Dados da tarefa, com a chave "status".
+
+        Returns:
+            None
+        """
+        with self.condition:
+            if task_id in self.tasks and task["status"] in FINAL_STATUSES:
+                self.tasks[task_id]["result"] = task
+                self.condition.notify_all()
+
+    def poll(self):
+        """
+        Consulta as tarefas em andamento até que não haja mais nenhuma pendente. Um erro de conexão ou uma
+        resposta inválida apenas adia a próxima consulta da tarefa, com o mesmo intervalo exponencial.
+
+        Returns:
+            None
+        """
+        while True:
+            with self.condition:
+                pending = {
+                    task_id: task for task_id, task in self.tasks.items() if task["result"] is None
+                }
+                if not pending:
+                    self.poller = None
+                    return
+                now = time.time()
+                due = [task_id for task_id, task in pending.items() if task["next_poll"] <= now]
+                if not due:
+                    self.condition.wait(min(task["next_poll"] for task in pending.values()) - now)
+                    continue
+
+            for task_id in due:
+                try:
+                    response = self.session.get(
+                        f"{self.sonar_url}/api/ce/task", params={"id": task_id}
+                    )
+                    task = response.json().get("task", {}) if response.ok else {}
+                except (requests.RequestException, ValueError):
+                    task = {}
+                if task.get("status") in FINAL_STATUSES:
+                    self.complete(task_id, task)
+                    continue
+                with self.condition:
+                    if task_id in self.tasks:
+                        state = self.tasks[task_id]
+                        state["delay"] = min(state["delay"] * 2, self.max_delay)
+                        state["next_poll"] = time.time() + state["delay"]
+
+
+class WebhookReceiver:
+    def __init__(self, tracker, host="0.0.0.0", port=8085, secret=None) -> None:
+        """
+        Servidor HTTP que recebe o webhook enviado pelo SonarQube ao fim de cada análise e finaliza a tarefa
+        correspondente no CeTaskTracker, sem esperar pela próxima consulta. O webhook deve ser cadastrado no
+        SonarQube apontando para este servidor.
+
+        Args:
+            tracker (CeTaskTracker): Acompanhamento das tarefas.
+            host (str): Endereço em que o servidor escuta.
+            port (int): Porta em que o servidor escuta.
+            secret (str): Segredo do webhook, usado para validar o cabeçalho X-Sonar-Webhook-HMAC-SHA256.
+        """
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not receiver.is_valid(body, self.headers.get("X-Sonar-Webhook-HMAC-SHA256")):
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                payload = json.loads(body)
+                tracker.complete(payload["taskId"], {**payload, "id": payload["taskId"]})
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.secret = secret
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    def is_valid(self, body, signature):
+        if self.secret is None:
+            return True
+        expected = hmac.new(self.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+        return signature is not None and hmac.compare_digest(expected, signature)
+
+    def start(self):
+        """
+        Inicia o servidor em uma thread separada.
+
+        Returns:
+            None
+        """
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Encerra o servidor.
+
+        Returns:
+            None
+        """
+        self.server.shutdown()
+        self.server.server_close()